@@ -0,0 +1,78 @@
+# benchmarks/bench_production.py
+"""
+Сравнение путей BuildingManager.produce_all: по порядку постройки
+(dict и numpy) и распределителем ресурсов (allocation = priority).
+
+    python benchmarks/bench_production.py --sizes 100 5000 50000 --ticks 50
+    python benchmarks/bench_production.py --scarce   # дефицит ресурсов
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.resource_manager import ResourceManager
+from core.simulation import load_balance
+from worlds.building_manager import BuildingManager
+
+
+def with_allocation(balance, mode):
+    return dict(balance, simulation=dict(balance.get("simulation", {}), allocation=mode))
+
+
+def make_colony(balance, size, vectorized, scarce=False, seed=1):
+    rnd = random.Random(seed)
+    types = list(balance["buildings"].keys())
+
+    resources = ResourceManager(balance)
+    # по умолчанию хватает на всё — меряем чистую стоимость тика;
+    # scarce — почти пустые склады, часть зданий простаивает
+    for rid in resources.values:
+        resources.set(rid, 0.5 if scarce else 1e12)
+
+    buildings = BuildingManager(balance, 128)
+    if vectorized and not buildings.enable_vectorized():
+        return None, None
+    buildings.load_from_save_data([
+        {"type": rnd.choice(types), "grid_x": i % 1000, "grid_y": i // 1000, "level": rnd.randint(1, 5)}
+        for i in range(size)
+    ])
+    return buildings, resources
+
+
+def bench(balance, size, ticks, vectorized, scarce=False):
+    buildings, resources = make_colony(balance, size, vectorized, scarce)
+    if buildings is None:
+        return None
+    buildings.produce_all(resources)  # прогрев (и сборка массивов)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        buildings.produce_all(resources)
+    return (time.perf_counter() - t0) / ticks * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 50000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--scarce", action="store_true")
+    args = parser.parse_args()
+
+    balance = load_balance("balance.json")
+    order = with_allocation(balance, "order")
+    shared = with_allocation(balance, "priority")
+
+    print(f"{'здания':>8} {'dict, мс/тик':>14} {'numpy, мс/тик':>14} {'распред., мс/тик':>17}")
+    for size in args.sizes:
+        dict_ms = bench(order, size, args.ticks, False, args.scarce)
+        np_ms = bench(order, size, args.ticks, True, args.scarce)
+        alloc_ms = bench(shared, size, args.ticks, False, args.scarce)
+        np_col = f"{np_ms:>14.4f}" if np_ms is not None else f"{'нет numpy':>14}"
+        print(f"{size:>8} {dict_ms:>14.4f} {np_col} {alloc_ms:>17.4f}")
+
+
+if __name__ == "__main__":
+    main()
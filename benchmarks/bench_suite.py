@@ -0,0 +1,315 @@
+# benchmarks/bench_suite.py
+"""
+Набор замеров без окна (SDL_VIDEODRIVER=dummy): горячие места игры
+на колониях от 10 до 100k зданий. Результат — JSON, чтобы сравнивать
+прогоны на разных коммитах; с --baseline отмечаются регрессии.
+
+    python benchmarks/bench_suite.py --out bench_results.json
+    python benchmarks/bench_suite.py --sizes 10 1000 --cases produce_all game.draw
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --update-baseline   # записать текущий прогон как эталон
+
+Код выхода 1, если против эталона есть регрессии (для CI).
+
+Что меряется (мс на один вызов, кроме can_place):
+    produce_all          BuildingManager.produce_all, один тик, ресурсов вдоволь
+    can_place            1000 проверок BuildingManager.can_place по случайным клеткам
+    game.update          Game.update(16) — один кадр логики
+    game.draw            Game.draw() целым кадром (dirty-rect выключен)
+    shop.draw            Shop.draw
+    hud.draw_top_center  ResourceManager.draw_top_center после изменения ресурса
+    save.save            SaveManager.save полного снимка во временную папку
+    save.load            SaveManager.load этого снимка
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# бюджет на один замер: не меньше MIN_RUNS вызовов, дальше — пока не истечёт
+MIN_RUNS = 3
+TIME_BUDGET_S = 2.0
+
+# разница меньше этой — шум, даже если в процентах много
+NOISE_FLOOR_MS = 0.05
+
+
+# ---------- колония ----------
+
+class Colony:
+    """
+    Game с колонией из size зданий. Здания стоят плотным прямоугольником
+    от начала мира (не шире мира) — камера в углу видит полное поле при
+    любом size >= 100. Если здания не влезают в WORLD_ROWS, мир для
+    замера растёт вниз. Сохранения пишутся во временную папку,
+    save.json игрока не трогаем.
+    """
+    def __init__(self, screen, size, tmpdir, seed=1):
+        from core.save_manager import SaveManager
+        from game import Game
+        from settings import WINDOW_WIDTH, WINDOW_HEIGHT, WORLD_COLS, WORLD_ROWS, ZOOM_LEVELS
+        from worlds.grid import Grid
+
+        self.size = size
+        game = self.game = Game(screen, WINDOW_WIDTH, WINDOW_HEIGHT, dirty_rects=False)
+        self.save_manager = SaveManager(os.path.join(tmpdir, f"save_{size}.json"), backups=0)
+        game.save_manager = self.save_manager
+        game.engine.journal = self.save_manager.append
+        # чистая игра: ни сохранения, ни оффлайн-прогресса
+        game.engine.reset()
+
+        cols = min(WORLD_COLS, max(1, math.ceil(math.sqrt(size))))
+        rows = math.ceil(size / cols)
+        if rows > WORLD_ROWS:
+            game.grid = Grid(
+                WINDOW_WIDTH, WINDOW_HEIGHT, game.cell_size, game.shop_width,
+                WORLD_COLS, rows, zoom_levels=ZOOM_LEVELS
+            )
+        self.cols, self.rows = game.grid.cols, game.grid.rows
+
+        # как загрузка сохранения: без анимации спавна и таймеров на каждое здание
+        rnd = random.Random(seed)
+        types = list(game.balance["buildings"])
+        game.buildings.load_from_save_data([
+            {"type": rnd.choice(types), "grid_x": i % cols, "grid_y": i // cols, "level": rnd.randint(1, 5)}
+            for i in range(size)
+        ])
+
+        # ресурсов вдоволь — меряем чистую стоимость, без простоя зданий
+        for rid in game.resources.values:
+            game.resources.set(rid, 1e12)
+
+        # пробы — вокруг колонии, включая пустые клетки за её краем
+        self.probes = [
+            (rnd.randrange(min(cols + 8, self.cols)), rnd.randrange(min(rows + 8, self.rows)))
+            for _ in range(1000)
+        ]
+
+
+# ---------- замеры ----------
+
+def case_produce_all(colony):
+    g = colony.game
+    return lambda: g.buildings.produce_all(g.resources)
+
+
+def case_can_place(colony):
+    buildings = colony.game.buildings
+    probes = colony.probes
+    cols, rows = colony.cols, colony.rows
+
+    def run():
+        for gx, gy in probes:
+            buildings.can_place(gx, gy, cols, rows)
+    return run
+
+
+def case_game_update(colony):
+    g = colony.game
+    return lambda: g.update(16)
+
+
+def case_game_draw(colony):
+    return colony.game.draw
+
+
+def case_shop_draw(colony):
+    g = colony.game
+    return lambda: g.shop.draw(g.screen, g.font, g.buildings)
+
+
+def case_hud(colony):
+    g = colony.game
+
+    def run():
+        # значение поменялось — полоска пересобирается, как после тика
+        g.resources.add("materials", 1)
+        g.resources.draw_top_center(g.screen, g.font, g.width)
+    return run
+
+
+def case_save(colony):
+    g = colony.game
+    return lambda: colony.save_manager.save(g.engine.to_save_data())
+
+
+def case_load(colony):
+    colony.save_manager.save(colony.game.engine.to_save_data())
+    return colony.save_manager.load
+
+
+CASES = {
+    "produce_all": case_produce_all,
+    "can_place": case_can_place,
+    "game.update": case_game_update,
+    "game.draw": case_game_draw,
+    "shop.draw": case_shop_draw,
+    "hud.draw_top_center": case_hud,
+    "save.save": case_save,
+    "save.load": case_load,
+}
+
+
+def measure(fn, min_runs=MIN_RUNS, budget_s=TIME_BUDGET_S, max_runs=200):
+    fn()  # прогрев: кэши, сборка таблиц
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_runs:
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        if len(samples) >= min_runs and time.perf_counter() - started > budget_s:
+            break
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "min_ms": samples[0],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "runs": len(samples),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=10
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(sizes, cases, budget_s=TIME_BUDGET_S):
+    from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+    # игра грузит assets/ и balance.json относительными путями
+    os.chdir(ROOT)
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    results = {name: {} for name in cases}
+    tmpdir = tempfile.mkdtemp(prefix="colony_bench_")
+    try:
+        for size in sizes:
+            t0 = time.perf_counter()
+            colony = Colony(screen, size, tmpdir)
+            print(f"колония {size}: собрана за {time.perf_counter() - t0:.1f} с")
+            for name in cases:
+                stats = measure(CASES[name](colony), budget_s=budget_s)
+                results[name][str(size)] = stats
+                print(f"  {name:<22} {stats['median_ms']:>10.3f} мс  (p95 {stats['p95_ms']:.3f}, {stats['runs']} раз)")
+            colony.save_manager.wait()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        pygame.quit()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+# ---------- сравнение с эталоном ----------
+
+def compare(current, baseline, threshold):
+    """
+    [(case, size, было, стало, отношение, регрессия?)] по общим замерам.
+    Регрессия — медиана выросла больше чем на threshold и больше шума.
+    """
+    rows = []
+    for name, by_size in current["results"].items():
+        base_sizes = baseline.get("results", {}).get(name, {})
+        for size, stats in by_size.items():
+            base = base_sizes.get(size)
+            if not base:
+                continue
+            old, new = base["median_ms"], stats["median_ms"]
+            ratio = new / old if old > 0 else float("inf")
+            regressed = ratio > 1.0 + threshold and new - old > NOISE_FLOOR_MS
+            rows.append((name, int(size), old, new, ratio, regressed))
+    return rows
+
+
+def print_comparison(rows, baseline):
+    commit = baseline.get("meta", {}).get("commit")
+    print(f"\nсравнение с эталоном ({commit or 'без коммита'}):")
+    print(f"{'замер':<22} {'здания':>8} {'было, мс':>11} {'стало, мс':>11} {'x':>7}")
+    for name, size, old, new, ratio, regressed in rows:
+        mark = "  <-- регрессия" if regressed else ""
+        print(f"{name:<22} {size:>8} {old:>11.3f} {new:>11.3f} {ratio:>7.2f}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET_S, help="секунд на один замер")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help=f"эталон для сравнения (обычно {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост медианы, доля")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # пути из командной строки — от папки, откуда запустили
+    out = os.path.abspath(args.out)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    report = run_suite(args.sizes, args.cases, args.budget)
+
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nрезультаты: {out}")
+
+    if args.update_baseline:
+        with open(baseline_path or DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"эталон обновлён: {baseline_path or DEFAULT_BASELINE}")
+        return 0
+
+    if baseline_path is None:
+        return 0
+    if not os.path.exists(baseline_path):
+        print("Эталон не найден:", baseline_path)
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(report, baseline, args.threshold)
+    print_comparison(rows, baseline)
+    regressions = [r for r in rows if r[5]]
+    if regressions:
+        print(f"регрессий: {len(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
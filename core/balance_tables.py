@@ -0,0 +1,251 @@
+# core/balance_tables.py
+"""
+balance.json, проверенный и собранный в таблицы один раз при старте.
+
+Вложенные словари конфига читаются только здесь. Остальной код
+(производство, апгрейды, магазин, оффлайн-прогресс) берёт готовые
+множители уровней, цены и плотные индексы ресурсов из BalanceTables.
+Таблицы не меняются после сборки: кортежи вместо списков,
+наружу словари отдаются копиями.
+"""
+from core.ledger import to_units
+
+
+# уровень, до которого считаются таблицы, если max_level не задан
+DEFAULT_MAX_LEVEL = 5
+# сколько цен магазина считать заранее (дальше — досчитываются)
+PRICE_STEPS = 64
+# как делить ресурс при дефиците (simulation.allocation):
+# priority (по умолчанию) — по "priority" зданий, при равном — поровну
+# в долях; proportional — всем поровну в долях; order — по порядку
+# постройки, производство доступно следующим в том же тике (как было раньше)
+ALLOCATION_MODES = ("priority", "proportional", "order")
+# виды условий заданий (balance.json, "quests") и их обязательные поля
+QUEST_TYPES = {
+    "resource": ("resource", "at_least"),
+    "building_count": ("building", "at_least"),
+    "building_level": ("building", "level"),
+}
+
+
+class BalanceError(ValueError):
+    """balance.json не проходит проверку — список всех проблем в тексте."""
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_amounts(problems, where, amounts):
+    if not isinstance(amounts, dict):
+        problems.append(f"{where}: ожидается словарь ресурс -> число")
+        return {}
+    for rid, amount in amounts.items():
+        if not _is_number(amount) or amount < 0:
+            problems.append(f"{where}.{rid}: ожидается неотрицательное число, а не {amount!r}")
+    return amounts
+
+
+class BuildingType:
+    """Собранный тип здания: всё, что раньше читалось из cfg на каждом вызове."""
+    def __init__(self, btype, index, cfg, resource_index, max_level):
+        self.id = btype
+        self.index = index
+        self.name = cfg.get("name", btype)
+        self.sprite = cfg.get("sprite")
+        self.max_level = max_level
+        self.level_multiplier = cfg.get("level_multiplier", 1.0)
+        self.price_growth = cfg.get("price_growth", 1.0)
+        # при дефиците ресурсы сначала получают здания с большим priority
+        self.priority = cfg.get("priority", 0)
+
+        # [(ресурс, за тик на 1 уровне)] без нулей
+        self.production = tuple((rid, a) for rid, a in cfg.get("production", {}).items() if a)
+        self.consumption = tuple((rid, a) for rid, a in cfg.get("consumption", {}).items() if a)
+        # то же с плотными индексами ресурсов
+        self.production_idx = tuple((resource_index[rid], a) for rid, a in self.production)
+        self.consumption_idx = tuple((resource_index[rid], a) for rid, a in self.consumption)
+
+        # level_factors[level] = mult ** (level-1); [0] не используется
+        self.level_factors = (1.0,) + tuple(
+            self.level_multiplier ** (level - 1) if level > 1 else 1.0
+            for level in range(1, max_level + 2)
+        )
+
+        # то же в делениях учёта (core.ledger) по уровням:
+        # level_units[level] = (потребление, производство) за тик
+        self.level_units = (None,) + tuple(self._units(level) for level in range(1, max_level + 1))
+
+        # цены магазина: prices[n] — цена после n покупок
+        # (каждая покупка: int(цена * price_growth), как и раньше)
+        price = dict(cfg.get("base_price", {}))
+        prices = []
+        for _ in range(PRICE_STEPS):
+            prices.append(tuple(price.items()))
+            price = {rid: int(val * self.price_growth) for rid, val in price.items()}
+        self.prices = tuple(prices)
+
+        unlock = cfg.get("unlock", {})
+        self.min_materials = unlock.get("min_materials", 0)
+        self.requires = tuple(unlock.get("requires", []))
+
+    # ---------- уровни ----------
+
+    def level_factor(self, level):
+        if 0 < level < len(self.level_factors):
+            return self.level_factors[level]
+        # апгрейды выше max_level не запрещены — досчитываем
+        return self.level_multiplier ** (level - 1) if level > 1 else 1.0
+
+    def _units(self, level):
+        f = self.level_factor(level)
+        need = tuple((r, to_units(a * f)) for r, a in self.consumption_idx)
+        out = tuple((r, to_units(a * f)) for r, a in self.production_idx)
+        return need, out
+
+    def units(self, level):
+        """(потребление, производство) за тик: [(слот, деления)]."""
+        if 0 < level < len(self.level_units):
+            return self.level_units[level]
+        return self._units(level)
+
+    def production_at(self, level):
+        f = self.level_factor(level)
+        return {rid: a * f for rid, a in self.production}
+
+    def consumption_at(self, level):
+        f = self.level_factor(level)
+        return {rid: a * f for rid, a in self.consumption}
+
+    # ---------- магазин ----------
+
+    def price(self, bought=0):
+        if bought < len(self.prices):
+            return dict(self.prices[bought])
+        price = dict(self.prices[-1])
+        for _ in range(bought - len(self.prices) + 1):
+            price = {rid: int(val * self.price_growth) for rid, val in price.items()}
+        return price
+
+    def unlock_error(self, materials, has_building):
+        """
+        None, если здание можно покупать, иначе текст для игрока.
+        has_building(btype) -> bool — есть ли уже такое здание.
+        """
+        if materials < self.min_materials:
+            return f"Нужно минимум {self.min_materials} материалов!"
+        for req in self.requires:
+            if not has_building(req):
+                return "Сначала постройте: " + ", ".join(self.requires)
+        return None
+
+
+class BalanceTables:
+    def __init__(self, balance):
+        problems = []
+
+        # ресурсы -> плотные индексы (порядок из balance.json, затем
+        # ресурсы, которые встречаются только у зданий)
+        resource_ids = []
+        for i, res in enumerate(balance.get("resources", [])):
+            if not isinstance(res, dict) or "id" not in res:
+                problems.append(f"resources[{i}]: нет id")
+                continue
+            if res["id"] in resource_ids:
+                problems.append(f"resources[{i}]: повтор id {res['id']!r}")
+                continue
+            resource_ids.append(res["id"])
+            for key in ("min", "max"):
+                if res.get(key) is not None and not _is_number(res[key]):
+                    problems.append(f"resources[{i}].{key}: ожидается число")
+
+        buildings_cfg = balance.get("buildings", {})
+        for btype, cfg in buildings_cfg.items():
+            where = f"buildings.{btype}"
+            if not isinstance(cfg, dict):
+                problems.append(f"{where}: ожидается словарь")
+                continue
+            for key in ("production", "consumption", "base_price"):
+                for rid in _check_amounts(problems, f"{where}.{key}", cfg.get(key, {})):
+                    if rid not in resource_ids:
+                        resource_ids.append(rid)
+            for key in ("price_growth", "level_multiplier"):
+                if key in cfg and (not _is_number(cfg[key]) or cfg[key] < 0):
+                    problems.append(f"{where}.{key}: ожидается неотрицательное число")
+            max_level = cfg.get("max_level", DEFAULT_MAX_LEVEL)
+            if not isinstance(max_level, int) or max_level < 1:
+                problems.append(f"{where}.max_level: ожидается целое >= 1")
+            if not isinstance(cfg.get("priority", 0), int):
+                problems.append(f"{where}.priority: ожидается целое")
+            for req in cfg.get("unlock", {}).get("requires", []):
+                if req not in buildings_cfg:
+                    problems.append(f"{where}.unlock.requires: неизвестное здание {req!r}")
+
+        up_cfg = balance.get("upgrade", {})
+        base_cost = _check_amounts(problems, "upgrade.base_cost", up_cfg.get("base_cost", {}))
+        cost_growth = up_cfg.get("cost_growth", 1.0)
+        if not _is_number(cost_growth) or cost_growth < 0:
+            problems.append("upgrade.cost_growth: ожидается неотрицательное число")
+
+        allocation = balance.get("simulation", {}).get("allocation", "priority")
+        if allocation not in ALLOCATION_MODES:
+            problems.append(f"simulation.allocation: одно из {', '.join(ALLOCATION_MODES)}, а не {allocation!r}")
+
+        quests = balance.get("quests", [])
+        for i, quest in enumerate(quests):
+            where = f"quests[{i}]"
+            fields = QUEST_TYPES.get(quest.get("type"))
+            if fields is None:
+                problems.append(f"{where}.type: одно из {', '.join(QUEST_TYPES)}")
+                continue
+            for key in ("id", "text") + fields:
+                if key not in quest:
+                    problems.append(f"{where}: нет поля {key}")
+            if "resource" in fields and quest.get("resource") not in resource_ids:
+                problems.append(f"{where}.resource: неизвестный ресурс {quest.get('resource')!r}")
+            if "building" in fields and quest.get("building") not in buildings_cfg:
+                problems.append(f"{where}.building: неизвестное здание {quest.get('building')!r}")
+
+        if problems:
+            raise BalanceError("Ошибки в balance.json:\n  " + "\n  ".join(problems))
+
+        self.resource_ids = tuple(resource_ids)
+        self.resource_index = {rid: i for i, rid in enumerate(self.resource_ids)}
+        # необязательные ограничения "min"/"max" из balance.json по слотам
+        limits = {res["id"]: res for res in balance.get("resources", [])}
+        self.resource_min = tuple(limits.get(rid, {}).get("min") for rid in self.resource_ids)
+        self.resource_max = tuple(limits.get(rid, {}).get("max") for rid in self.resource_ids)
+
+        self.types = {}
+        for index, (btype, cfg) in enumerate(buildings_cfg.items()):
+            self.types[btype] = BuildingType(
+                btype, index, cfg, self.resource_index,
+                cfg.get("max_level", DEFAULT_MAX_LEVEL)
+            )
+        self.type_ids = tuple(self.types)
+
+        # стоимость апгрейда с уровня lvl: int(base * growth^(lvl-1))
+        self.max_level = max([t.max_level for t in self.types.values()], default=DEFAULT_MAX_LEVEL)
+        self.upgrade_base_cost = tuple(base_cost.items())
+        self.upgrade_cost_growth = cost_growth
+        self.upgrade_costs = (None,) + tuple(
+            self._scaled_upgrade_cost(level) for level in range(1, self.max_level + 1)
+        )
+
+        self.click_gain = balance.get("click", {}).get("materials_gain", 0)
+        self.allocation = allocation
+        # задания по порядку; QuestManager собирает из них условия
+        self.quests = tuple(dict(quest) for quest in quests)
+
+    def _scaled_upgrade_cost(self, level):
+        factor = self.upgrade_cost_growth ** (level - 1)
+        return tuple((rid, int(base * factor)) for rid, base in self.upgrade_base_cost)
+
+    def get(self, btype):
+        """BuildingType или None для неизвестного типа."""
+        return self.types.get(btype)
+
+    def upgrade_cost(self, level):
+        if 0 < level < len(self.upgrade_costs):
+            return dict(self.upgrade_costs[level])
+        return dict(self._scaled_upgrade_cost(level))
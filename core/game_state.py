@@ -8,9 +8,8 @@ class GameState:
         self.first_goal = True
         self.show_hint = True
 
-        # таймеры
-        self.consumption_timer = 0
-        self.consumption_interval = 5000  # мс
+        # потребление населением — повторяющийся таймер движка (core.timers)
+        self.consumption_interval = 5000  # мс симуляции (тики TickClock)
 
     def is_playing(self):
         return self.state == "playing"
@@ -23,4 +22,3 @@ class GameState:
         self.selected_building_type = None
         self.first_goal = True
         self.show_hint = True
-        self.consumption_timer = 0
@@ -0,0 +1,142 @@
+# core/ledger.py
+"""
+Учёт ресурсов в целых числах.
+
+Значения хранятся плотным массивом int64 (array('q')) в фиксированной
+точке: 1 единица ресурса = SCALE делений. Сложение целых точное, поэтому
+сумма за сутки игры не зависит от того, как тики разбиты на пачки,
+а в сохранение попадает короткое число без хвоста 52.73999999999814.
+
+Слоты — порядок ресурсов из BalanceTables.resource_ids; ресурс, которого
+нет в balance.json, получает новый слот при первой записи.
+"""
+from array import array
+from collections.abc import MutableMapping
+
+
+# делений в одной единице ресурса (точность 1e-6)
+SCALE = 1_000_000
+
+
+def to_units(value):
+    return int(round(value * SCALE))
+
+
+def from_units(units):
+    return units / SCALE
+
+
+class ResourceLedger:
+    def __init__(self, resource_ids, mins=None, maxs=None):
+        self.ids = list(resource_ids)
+        self.index = {rid: i for i, rid in enumerate(self.ids)}
+        self.units = array("q", [0] * len(self.ids))
+        # слоты, менявшиеся с последнего take_changed() (для подписчиков)
+        self.changed = set()
+
+        # ограничения по слотам в делениях, None — без ограничения
+        self.mins = [None if v is None else to_units(v) for v in (mins or [None] * len(self.ids))]
+        self.maxs = [None if v is None else to_units(v) for v in (maxs or [None] * len(self.ids))]
+
+    def slot(self, rid):
+        i = self.index.get(rid)
+        if i is None:
+            i = len(self.ids)
+            self.ids.append(rid)
+            self.index[rid] = i
+            self.units.append(0)
+            self.mins.append(None)
+            self.maxs.append(None)
+        return i
+
+    def _clamp(self, i, units):
+        lo = self.mins[i]
+        if lo is not None and units < lo:
+            return lo
+        hi = self.maxs[i]
+        if hi is not None and units > hi:
+            return hi
+        return units
+
+    # ---------- по одному слоту ----------
+
+    def get_units(self, i):
+        return self.units[i]
+
+    def set_units(self, i, units):
+        self.units[i] = self._clamp(i, units)
+        self.changed.add(i)
+
+    def add_units(self, i, delta):
+        self.units[i] = self._clamp(i, self.units[i] + delta)
+        self.changed.add(i)
+
+    def take_changed(self):
+        """Id ресурсов, менявшихся с прошлого вызова."""
+        if not self.changed:
+            return ()
+        rids = [self.ids[i] for i in self.changed]
+        self.changed = set()
+        return rids
+
+    # ---------- пачками ----------
+
+    def affordable(self, pairs, times=1):
+        """Сколько раз (не больше times) можно оплатить [(слот, деления)]."""
+        units = self.units
+        for i, u in pairs:
+            if u > 0:
+                n = units[i] // u
+                if n < times:
+                    times = n
+        return max(0, times)
+
+    def debit(self, pairs, times=1):
+        for i, u in pairs:
+            self.add_units(i, -u * times)
+
+    def credit(self, pairs, times=1):
+        for i, u in pairs:
+            self.add_units(i, u * times)
+
+    def apply_vector(self, delta):
+        """Плотный вектор приращений по слотам (список или массив целых)."""
+        for i, d in enumerate(delta):
+            if d:
+                self.add_units(i, int(d))
+
+    def vector(self):
+        return list(self.units)
+
+    # ---------- сохранение ----------
+
+    def to_dict(self):
+        # units / SCALE печатается кратчайшей записью: 52.74, а не 52.7399...
+        return {rid: from_units(self.units[i]) for i, rid in enumerate(self.ids)}
+
+
+class LedgerView(MutableMapping):
+    """
+    ResourceLedger как словарь id -> float, для старого кода
+    (resources.values, EventManager). Запись проходит через ограничения.
+    """
+    def __init__(self, ledger):
+        self._ledger = ledger
+
+    def __getitem__(self, rid):
+        i = self._ledger.index.get(rid)
+        if i is None:
+            raise KeyError(rid)
+        return from_units(self._ledger.units[i])
+
+    def __setitem__(self, rid, value):
+        self._ledger.set_units(self._ledger.slot(rid), to_units(value))
+
+    def __delitem__(self, rid):
+        raise TypeError("ресурсы из учёта не удаляются")
+
+    def __iter__(self):
+        return iter(list(self._ledger.ids))
+
+    def __len__(self):
+        return len(self._ledger.ids)
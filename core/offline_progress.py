@@ -0,0 +1,196 @@
+# core/offline_progress.py
+import time
+
+
+# ниже этого ресурс считаем нулевым
+EPS = 1e-9
+
+
+class OfflineProgress:
+    """
+    Прогресс за время, пока игра была закрыта, — без прогона тиков.
+
+    Между событиями колония линейна: каждое здание тратит и производит
+    с постоянной скоростью, так что ресурсы меняются как R + rate * t.
+    События — это «ресурс кончился / вышел из минуса» (меняется набор
+    работающих зданий) и таймеры движка (core.timers): потребление
+    населением раз в consumption_interval делает сам SimulationEngine. От события
+    до события прыгаем сразу, поэтому часы отсутствия — это тысячи шагов,
+    а не миллионы тиков.
+
+    Дефицит — как у ProductionAllocator: когда ресурс на нуле, его
+    производство делится между потребителями по уровням priority,
+    внутри уровня — в равных долях. В режиме order
+    уровни — группы (тип, уровень) в порядке первой постройки: это
+    приближение очереди по списку, точное, пока здания одной группы
+    построены подряд.
+    """
+    # предохранитель от зацикливания на одном отрезке
+    MAX_EVENTS_PER_SEGMENT = 64
+
+    def __init__(self, engine):
+        self.engine = engine
+        tables = engine.tables
+        self.resource_ids = list(tables.resource_ids)
+
+        # здания одного типа и уровня работают одинаково — считаем группами
+        counts = {}
+        for b in engine.buildings.buildings:
+            if b.type in tables.types:
+                counts[(b.type, b.level)] = counts.get((b.type, b.level), 0) + 1
+
+        # уровни priority, от старшего к младшему (как в ProductionAllocator);
+        # в режиме order уровень — сама группа, по первой постройке
+        # (словарь counts хранит порядок, в котором группы встретились)
+        in_order = tables.allocation == "order"
+        by_priority = tables.allocation == "priority"
+        priorities = sorted({tables.get(t).priority if by_priority else 0 for t, _ in counts}, reverse=True)
+        self.n_tiers = len(counts) if in_order else len(priorities)
+
+        # группы: (need [(r, за тик)], out [(r, за тик)]) и уровень каждой
+        self.groups = []
+        self.group_tier = []
+        for (btype, level), count in counts.items():
+            btable = tables.get(btype)
+            k = btable.level_factor(level) * count
+            need = [(r, a * k) for r, a in btable.consumption_idx]
+            out = [(r, a * k) for r, a in btable.production_idx]
+            self.groups.append((need, out))
+            if in_order:
+                self.group_tier.append(len(self.group_tier))
+            else:
+                self.group_tier.append(priorities.index(btable.priority if by_priority else 0))
+
+    # ---------- скорости ----------
+
+    def _factors(self, values):
+        """Доля работы каждой группы при текущих запасах."""
+        n_res = len(values)
+        # res_factor[уровень][ресурс] — доля спроса уровня, которую можно покрыть
+        res_factor = [[1.0] * n_res for _ in range(self.n_tiers)]
+        factors = [1.0] * len(self.groups)
+        for _ in range(20):
+            supply = [0.0] * n_res
+            demand = [[0.0] * n_res for _ in range(self.n_tiers)]
+            for f, t, (need, out) in zip(factors, self.group_tier, self.groups):
+                for r, a in out:
+                    supply[r] += f * a
+                for r, a in need:
+                    # спрос — с учётом того, что группа стоит из-за других ресурсов
+                    other = min([res_factor[t][q] for q, _ in need if q != r], default=1.0)
+                    demand[t][r] += other * a
+
+            new_res = [[1.0] * n_res for _ in range(self.n_tiers)]
+            for r in range(n_res):
+                if values[r] > EPS:
+                    continue
+                # на нуле — производство делится по уровням, в минусе — никому
+                left = supply[r] if values[r] >= -EPS else 0.0
+                for t in range(self.n_tiers):
+                    d = demand[t][r]
+                    if not d:
+                        continue
+                    share = min(1.0, left / d)
+                    new_res[t][r] = share
+                    left -= share * d
+
+            new = [
+                min([new_res[t][r] for r, _ in need], default=1.0)
+                for t, (need, _) in zip(self.group_tier, self.groups)
+            ]
+            if new == factors and new_res == res_factor:
+                break
+            factors, res_factor = new, new_res
+        return factors
+
+    def _rates(self, values):
+        rates = [0.0] * len(values)
+        for f, (need, out) in zip(self._factors(values), self.groups):
+            if not f:
+                continue
+            for r, a in out:
+                rates[r] += f * a
+            for r, a in need:
+                rates[r] -= f * a
+        return rates
+
+    def _advance_production(self, values, ticks):
+        remaining = ticks
+        for _ in range(self.MAX_EVENTS_PER_SEGMENT):
+            if remaining <= 0:
+                return
+            rates = self._rates(values)
+
+            # ближайшее событие: какой-то ресурс дошёл до нуля
+            step, hit = remaining, None
+            for r, (v, k) in enumerate(zip(values, rates)):
+                if v > EPS and k < 0:
+                    t = v / -k
+                elif v < -EPS and k > 0:
+                    t = -v / k
+                else:
+                    continue
+                if t < step:
+                    step, hit = t, r
+
+            for r, k in enumerate(rates):
+                values[r] += k * step
+            if hit is not None:
+                values[hit] = 0.0
+            remaining -= step
+
+        # слишком много событий подряд — остаток по последним скоростям
+        rates = self._rates(values)
+        for r, k in enumerate(rates):
+            values[r] += k * remaining
+
+    # ---------- прогон ----------
+
+    def run(self, elapsed_ms):
+        """
+        Продвигает движок на elapsed_ms симуляционного времени.
+        Возвращает отчёт: сколько прошло, изменения ресурсов, погибла ли колония.
+        """
+        t0 = time.perf_counter()
+        engine = self.engine
+        state = engine.state
+        resources = engine.resources
+        timers = engine.timers
+        tick_ms = engine.clock.tick_ms
+
+        before = {rid: resources.get(rid) for rid in self.resource_ids}
+        values = [resources.get(rid) for rid in self.resource_ids]
+
+        # сообщения за оффлайн не показываем по одному — только итог
+        notify = engine.notify
+        messages = []
+        engine.notify = lambda text, duration=2000: messages.append(text)
+
+        left = elapsed_ms
+        events = 0
+        try:
+            while left > 0 and state.is_playing():
+                # до ближайшего таймера движка (потребление, события) — линейно
+                deadline = timers.next_deadline()
+                step = left if deadline is None else min(left, max(0, deadline - timers.now))
+                self._advance_production(values, step / tick_ms)
+                left -= step
+
+                for rid, v in zip(self.resource_ids, values):
+                    resources.set(rid, v)
+                events += timers.advance(step)
+                values = [resources.get(rid) for rid in self.resource_ids]
+        finally:
+            engine.notify = notify
+
+        for rid, v in zip(self.resource_ids, values):
+            resources.set(rid, v)
+
+        return {
+            "elapsed_ms": elapsed_ms - left,
+            "timer_events": events,
+            "delta": {rid: resources.get(rid) - before[rid] for rid in self.resource_ids},
+            "dead": not state.is_playing(),
+            "messages": len(messages),
+            "compute_ms": (time.perf_counter() - t0) * 1000.0,
+        }
@@ -0,0 +1,171 @@
+# core/profiler.py
+import json
+import os
+import time
+from collections import deque
+
+
+class _NullScope:
+    """Заглушка для выключенного профайлера: вход и выход ничего не делают."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._depth += 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        p = self.profiler
+        p._depth -= 1
+        p._events.append((self.name, self.start, end - self.start, p._depth))
+        return False
+
+
+class Profiler:
+    """
+    Замеры кадра по именованным областям:
+
+        profiler.frame_begin()
+        with profiler.scope("game.update"):
+            ...
+        profiler.frame_end()
+
+    Хранит кадры за последние trace_seconds: из них считаются p50/p99
+    времени кадра, среднее по областям и Chrome trace (chrome://tracing,
+    ui.perfetto.dev). Выключенный профайлер на scope() отдаёт общую
+    заглушку — ни часов, ни записей, только вызов метода.
+
+    Без pygame: время — time.perf_counter_ns, рисует ui.profiler_overlay.
+    """
+    def __init__(self, trace_seconds=10, history=60):
+        self.enabled = False
+        self.trace_ns = int(trace_seconds * 1e9)
+        # за сколько последних кадров усреднять области
+        self.history = history
+
+        # кадры: (начало, длительность, [(имя, начало, длительность, глубина)]), нс
+        self.frames = deque()
+        self._frame_start = None
+        self._events = []
+        self._depth = 0
+
+    def set_enabled(self, enabled):
+        """Включение начинает запись заново — старые кадры не смешиваются с новыми."""
+        self.enabled = enabled
+        self.clear()
+
+    def clear(self):
+        self.frames.clear()
+        self._frame_start = None
+        self._events = []
+        self._depth = 0
+
+    # ---------- запись ----------
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def frame_begin(self):
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter_ns()
+        self._events = []
+        self._depth = 0
+
+    def frame_end(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        self.frames.append((self._frame_start, end - self._frame_start, self._events))
+        self._frame_start = None
+        self._events = []
+
+        # за пределами окна трассы — выбрасываем
+        horizon = end - self.trace_ns
+        while self.frames and self.frames[0][0] < horizon:
+            self.frames.popleft()
+
+    # ---------- статистика ----------
+
+    def frame_times(self):
+        """Длительности кадров окна, мс, от старых к новым."""
+        return [dur / 1e6 for _, dur, _ in self.frames]
+
+    def percentiles(self, *qs):
+        """Перцентили времени кадра, мс: percentiles(0.5, 0.99)."""
+        times = sorted(self.frame_times())
+        if not times:
+            return [0.0 for _ in qs]
+        return [times[min(len(times) - 1, int(q * len(times)))] for q in qs]
+
+    def scope_stats(self):
+        """
+        [(имя, глубина, мс на кадр)] по последним history кадрам,
+        в порядке первого появления — вложенные идут за родителем.
+        """
+        recent = list(self.frames)[-self.history:]
+        if not recent:
+            return []
+        totals = {}
+        depths = {}
+        for _, _, events in recent:
+            # события пишутся на выходе, так что родитель после детей — сортируем по началу
+            for name, start, dur, depth in sorted(events, key=lambda e: e[1]):
+                totals[name] = totals.get(name, 0) + dur
+                depths.setdefault(name, depth)
+        n = len(recent)
+        return [(name, depths[name], total / n / 1e6) for name, total in totals.items()]
+
+    # ---------- Chrome trace ----------
+
+    def trace_events(self):
+        """События окна в формате Trace Event (ph = "X"), время в мкс от первого кадра."""
+        if not self.frames:
+            return []
+        origin = self.frames[0][0]
+        pid = os.getpid()
+        events = []
+        for start, dur, scopes in self.frames:
+            events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": pid, "tid": 0,
+                "ts": (start - origin) / 1000.0, "dur": dur / 1000.0,
+            })
+            for name, s_start, s_dur, _ in scopes:
+                events.append({
+                    "name": name, "cat": "scope", "ph": "X", "pid": pid, "tid": 0,
+                    "ts": (s_start - origin) / 1000.0, "dur": s_dur / 1000.0,
+                })
+        return events
+
+    def export_chrome_trace(self, path):
+        """Записать окно в JSON для chrome://tracing; возвращает число событий."""
+        events = self.trace_events()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+        return len(events)
+
+
+# общий профайлер на весь процесс
+profiler = Profiler()
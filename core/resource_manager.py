@@ -1,21 +1,46 @@
 # core/resource_manager.py
 import os
-import pygame
+
+from core.balance_tables import BalanceTables
+from core.ledger import ResourceLedger, LedgerView, to_units, from_units
 
 
 class ResourceManager:
-    def __init__(self, balance, icons_folder="assets/icons"):
+    """
+    Ресурсы колонии. Модуль не зависит от pygame: иконки подгружаются
+    отдельно через load_icons(), поэтому менеджер работает и без дисплея.
+
+    Значения лежат в ResourceLedger (целые деления, см. core.ledger);
+    get/set/add принимают и отдают float, как раньше, а производство
+    работает с делениями напрямую через ledger.
+    """
+    def __init__(self, balance, icons_folder=None, tables=None):
         self.balance = balance
         self.icons_folder = icons_folder
+        tables = tables or BalanceTables(balance)
 
-        # ресурсы: id -> value
-        self.values = {}
+        # учёт ресурсов: слоты по tables.resource_ids, ограничения min/max
+        self.ledger = ResourceLedger(tables.resource_ids, tables.resource_min, tables.resource_max)
+        # ресурсы: id -> value (словарь поверх ledger)
+        self.values = LedgerView(self.ledger)
         # видимость и порядок
         self.ordered_resources = []
         # иконки: id -> Surface
         self.icons = {}
 
+        # полоска ресурсов наверху: одна готовая картинка, пересобирается
+        # только когда меняется то, что на ней видно (см. hud_surface)
+        self.hud_version = 0
+        self._hud_key = None
+        self._hud = None
+        self._hud_pos = (0, 0)
+        # чем рендерить текст HUD: fn(font, text, color) -> Surface;
+        # Game даёт общий кэш (ui.text_cache), без него — font.render
+        self.render_text = None
+
         self._init_from_balance()
+        if self.icons_folder:
+            self.load_icons(self.icons_folder)
 
     def _init_from_balance(self):
         resources_cfg = self.balance.get("resources", [])
@@ -25,18 +50,31 @@ class ResourceManager:
             if res.get("visible", True):
                 self.ordered_resources.append(rid)
 
+    def reset(self):
+        """Возвращает все ресурсы к начальным значениям из balance.json."""
+        for res in self.balance.get("resources", []):
+            self.values[res["id"]] = res.get("initial", 0)
+
+    # ---------- иконки (нужен pygame) ----------
+
+    def load_icons(self, icons_folder="assets/icons"):
+        self.icons_folder = icons_folder
+        for res in self.balance.get("resources", []):
             icon_name = res.get("icon")
             if icon_name:
-                path = os.path.join(self.icons_folder, icon_name)
+                path = os.path.join(icons_folder, icon_name)
             else:
                 path = None
-            self.icons[rid] = self._load_icon(path)
+            self.icons[res["id"]] = self._load_icon(path)
+        self._hud_key = None
 
     def _load_icon(self, path):
+        import pygame
+        from ui.atlas import load_image
+
         try:
             if path and os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                return pygame.transform.scale(img, (32, 32))
+                return load_image(path, (32, 32))
         except Exception as e:
             print("Ошибка загрузки иконки ресурса:", path, e)
         # заглушка
@@ -49,50 +87,89 @@ class ResourceManager:
     # ---------- работа с ресурсами ----------
 
     def get(self, rid):
-        return self.values.get(rid, 0)
+        i = self.ledger.index.get(rid)
+        if i is None:
+            return 0
+        return from_units(self.ledger.units[i])
 
     def set(self, rid, value):
-        self.values[rid] = value
+        self.ledger.set_units(self.ledger.slot(rid), to_units(value))
 
     def add(self, rid, delta):
-        self.values[rid] = self.values.get(rid, 0) + delta
+        self.ledger.add_units(self.ledger.slot(rid), to_units(delta))
 
     def add_many(self, changes: dict):
         for rid, delta in changes.items():
             self.add(rid, delta)
 
+    def _cost_units(self, cost):
+        return [(self.ledger.slot(rid), to_units(needed)) for rid, needed in cost.items()]
+
     def can_afford_cost(self, cost: dict) -> bool:
-        for rid, needed in cost.items():
-            if self.get(rid) < needed:
-                return False
-        return True
+        return self.ledger.affordable(self._cost_units(cost)) >= 1
 
     def pay_cost(self, cost: dict) -> bool:
-        if not self.can_afford_cost(cost):
+        pairs = self._cost_units(cost)
+        if self.ledger.affordable(pairs) < 1:
             return False
-        for rid, needed in cost.items():
-            self.add(rid, -needed)
+        self.ledger.debit(pairs)
         return True
 
+    def snapshot(self):
+        """Копия для сохранения: id -> float без хвостов округления."""
+        return self.ledger.to_dict()
+
     # ---------- отрисовка ресурсов ----------
 
-    def draw_top_center(self, screen, font, width):
-        center_x = width // 2
-        y = 10
+    def displayed_values(self):
+        """То, что реально видно в HUD: целые значения видимых ресурсов."""
+        return tuple(int(self.get(rid)) for rid in self.ordered_resources)
+
+    def hud_surface(self, font, width):
+        """
+        (Surface, (x, y)) полоски ресурсов по центру окна шириной width.
+        Пересобирается, только если поменялись видимые целые значения,
+        набор видимых ресурсов, шрифт или ширина окна; при каждой
+        пересборке растёт hud_version.
+        """
+        key = (self.displayed_values(), tuple(self.ordered_resources), id(font), width)
+        if key != self._hud_key:
+            self._hud_key = key
+            self._hud, self._hud_pos = self._build_hud(font, width)
+            self.hud_version += 1
+        return self._hud, self._hud_pos
+
+    def hud_rect(self, font, width):
+        surf, (x, y) = self.hud_surface(font, width)
+        return (x, y, surf.get_width(), surf.get_height())
+
+    def _build_hud(self, font, width):
+        import pygame
 
         pieces = []
         total_width = 0
-
+        height = 1
         for rid in self.ordered_resources:
             icon = self.icons[rid]
-            value = int(self.get(rid))
-            txt = font.render(str(value), True, (255, 255, 255))
+            txt = self._render(font, str(int(self.get(rid))), (255, 255, 255))
             w = icon.get_width() + 6 + txt.get_width() + 20
             pieces.append((icon, txt, w))
             total_width += w
+            height = max(height, icon.get_height(), txt.get_height())
 
-        x = center_x - total_width // 2
+        surf = pygame.Surface((max(1, total_width), height), pygame.SRCALPHA)
+        x = 0
         for icon, txt, w in pieces:
-            screen.blit(icon, (x, y))
-            screen.blit(txt, (x + icon.get_width() + 6, y + (icon.get_height() - txt.get_height()) // 2))
+            surf.blit(icon, (x, 0))
+            surf.blit(txt, (x + icon.get_width() + 6, (icon.get_height() - txt.get_height()) // 2))
             x += w
+        return surf, (width // 2 - total_width // 2, 10)
+
+    def _render(self, font, text, color):
+        if self.render_text is not None:
+            return self.render_text(font, text, color)
+        return font.render(text, True, color)
+
+    def draw_top_center(self, screen, font, width):
+        surf, pos = self.hud_surface(font, width)
+        screen.blit(surf, pos)
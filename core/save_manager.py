@@ -1,13 +1,65 @@
 # core/save_manager.py
 import json
 import os
+import shutil
+import threading
+import time
 
 
 class SaveManager:
-    def __init__(self, filename="save.json"):
+    """
+    Сохранение в JSON.
+
+    Запись атомарная: временный файл -> fsync -> os.replace, поэтому
+    падение посреди записи не портит save.json. Перед заменой текущий
+    файл копируется в save.json.1, старые копии сдвигаются до .N.
+
+    save_async() отдаёт снимок фоновому потоку: сериализация и запись
+    не тормозят кадр. Если поток ещё занят, ждёт только самый свежий снимок.
+
+    Между полными снимками изменения дописываются в журнал save.json.journal
+    (append): постройки, апгрейды и контрольные точки ресурсов. У каждой
+    записи номер seq; снимок помнит journal_seq, до которого он всё учёл,
+    и после записи снимка журнал ужимается до более новых записей.
+    load() = снимок + проигрывание журнала.
+    """
+    def __init__(self, filename="save.json", backups=3):
         self.filename = filename
+        self.backups = backups
+        self.journal_path = filename + ".journal"
+
+        # журнал: номер последней записи и записей с последнего снимка
+        self.seq = 0
+        self.journal_entries = 0
+        self._journal_lock = threading.Lock()
+        self._journal_file = None
+
+        self._write_lock = threading.Lock()
+        self._cv = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._thread = None
+
+        # тайминги последнего сохранения, мс
+        self.last_snapshot_ms = None
+        self.last_write_ms = None
+        self.last_bytes = 0
 
     def load(self):
+        data = self._load_snapshot()
+        base_seq = data.get("journal_seq", 0) if data else 0
+        records = [r for r in self._read_journal() if r["seq"] > base_seq]
+
+        self.seq = max([base_seq] + [r["seq"] for r in records])
+        self.journal_entries = len(records)
+        if data is None and not records:
+            return None
+
+        data = data or {"resources": {}, "buildings": [], "state": {}}
+        self._replay(data, records)
+        return data
+
+    def _load_snapshot(self):
         if not os.path.exists(self.filename):
             return None
         try:
@@ -15,15 +67,200 @@ class SaveManager:
                 return json.load(f)
         except Exception as e:
             print("Ошибка загрузки сохранения:", e)
-            return None
+            return self._load_backup()
+
+    def _load_backup(self):
+        for i in range(1, self.backups + 1):
+            path = f"{self.filename}.{i}"
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                print("Загружена резервная копия:", path)
+                return data
+            except Exception as e:
+                print("Ошибка загрузки резервной копии:", path, e)
+        return None
+
+    # ---------- журнал ----------
+
+    def append(self, record: dict, sync=False):
+        """
+        Дописать изменение в журнал (вызывается с игрового потока).
+        sync — ещё и fsync; под той же блокировкой, иначе фоновый
+        _trim_journal может закрыть файл между записью и fsync.
+        """
+        self.seq += 1
+        self.journal_entries += 1
+        line = json.dumps(dict(record, seq=self.seq), ensure_ascii=False) + "\n"
+        with self._journal_lock:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_file.write(line)
+            self._journal_file.flush()
+            if sync:
+                os.fsync(self._journal_file.fileno())
+
+    def checkpoint(self, resources: dict, state: dict):
+        """Контрольная точка ресурсов — дёшево, размер не зависит от колонии."""
+        self.append({"op": "resources", "resources": resources, "state": state}, sync=True)
+
+    def has_snapshot(self):
+        return os.path.exists(self.filename)
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        records = []
+        with self._journal_lock:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # оборванная при падении последняя строка
+                        continue
+        return [r for r in records if isinstance(r, dict) and "seq" in r]
+
+    def _replay(self, data, records):
+        buildings = data.setdefault("buildings", [])
+        by_cell = {(b.get("grid_x"), b.get("grid_y")): b for b in buildings}
+        for r in records:
+            op = r.get("op")
+            if op == "place":
+                b = {"type": r["type"], "grid_x": r["grid_x"], "grid_y": r["grid_y"], "level": 1}
+                buildings.append(b)
+                by_cell[(b["grid_x"], b["grid_y"])] = b
+            elif op == "upgrade":
+                b = by_cell.get((r["grid_x"], r["grid_y"]))
+                if b:
+                    b["level"] = r["level"]
+            elif op == "resources":
+                data["resources"] = r["resources"]
+                data["state"] = r.get("state", {})
+
+    def _trim_journal(self, upto_seq):
+        """Выкинуть из журнала всё, что уже есть в снимке."""
+        with self._journal_lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            if not os.path.exists(self.journal_path):
+                return
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                keep = []
+                for line in f:
+                    try:
+                        if json.loads(line)["seq"] > upto_seq:
+                            keep.append(line)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(keep)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+
+    # ---------- полные снимки ----------
+
+    def _stamp(self, data):
+        # снимок учитывает журнал до текущей записи включительно
+        data["journal_seq"] = self.seq
+        self.journal_entries = 0
+        return data
 
     def save(self, data: dict):
+        # старый отложенный снимок больше не нужен — этот новее;
+        # а тот, что фоновый поток уже забрал, должен лечь раньше нашего
+        with self._cv:
+            self._pending = None
+        self.wait()
         try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._write(self._stamp(data))
         except Exception as e:
             print("Ошибка сохранения:", e)
 
+    def save_async(self, data: dict, snapshot_ms=None):
+        """
+        data — снимок, который больше не меняется игрой
+        (см. SimulationEngine.to_save_data); snapshot_ms — сколько
+        он снимался на игровом потоке, для отчёта. Заодно ужимает журнал.
+        """
+        self._stamp(data)
+        with self._cv:
+            self._pending = data
+            self.last_snapshot_ms = snapshot_ms
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="autosave", daemon=True)
+                self._thread.start()
+            self._cv.notify_all()
+
+    def wait(self):
+        """Дождаться, пока фоновая запись закончится."""
+        with self._cv:
+            while self._pending is not None or self._busy:
+                self._cv.wait()
+
+    def _worker(self):
+        while True:
+            with self._cv:
+                while self._pending is None:
+                    self._cv.wait()
+                data = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self._write(data)
+                snapshot = f"снимок {self.last_snapshot_ms:.1f} мс, " if self.last_snapshot_ms is not None else ""
+                print(f"Автосохранение: {snapshot}запись {self.last_bytes // 1024} КБ за {self.last_write_ms:.1f} мс")
+            except Exception as e:
+                print("Ошибка автосохранения:", e)
+            with self._cv:
+                self._busy = False
+                self._cv.notify_all()
+
+    def _write(self, data):
+        with self._write_lock:
+            t0 = time.perf_counter()
+            payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+            tmp_path = self.filename + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._rotate_backups()
+            os.replace(tmp_path, self.filename)
+            self._trim_journal(data.get("journal_seq", 0))
+
+            self.last_bytes = len(payload)
+            self.last_write_ms = (time.perf_counter() - t0) * 1000.0
+
+    def _rotate_backups(self):
+        if self.backups <= 0 or not os.path.exists(self.filename):
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.filename}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.filename}.{i + 1}")
+        shutil.copyfile(self.filename, f"{self.filename}.1")
+
     def reset(self):
-        if os.path.exists(self.filename):
-            os.remove(self.filename)
+        # отложенный снимок старой игры писать уже нельзя
+        with self._cv:
+            self._pending = None
+        self.wait()
+        with self._write_lock:
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
+            with self._journal_lock:
+                if self._journal_file is not None:
+                    self._journal_file.close()
+                    self._journal_file = None
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+        self.seq = 0
+        self.journal_entries = 0
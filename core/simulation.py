@@ -0,0 +1,239 @@
+# core/simulation.py
+import json
+import os
+import time
+
+from core.balance_tables import BalanceTables
+from core.game_state import GameState
+from core.offline_progress import OfflineProgress
+from core.profiler import profiler
+from core.resource_manager import ResourceManager
+from core.tick_clock import TickClock
+from core.timers import Scheduler
+
+from worlds.building_manager import BuildingManager
+
+from quest_manager import QuestManager
+from event_manager import EventManager
+
+
+def load_balance(path="balance.json"):
+    if not os.path.exists(path):
+        print("Внимание: нет", path)
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print("Ошибка чтения balance.json:", e)
+        return {}
+
+
+class SimulationEngine:
+    """
+    Симуляция колонии без pygame: ресурсы, здания, таймер потребления,
+    квесты и события. Game только оборачивает её для отрисовки,
+    а в CI / на сервере движок можно крутить напрямую:
+
+        engine = SimulationEngine(load_balance(), save_data)
+        for _ in range(10000):
+            engine.update(16)
+    """
+    def __init__(self, balance, save_data=None, cell_size=128, notify=None, events_enabled=False):
+        self.balance = balance
+        # проверенный и собранный balance.json — читают все подсистемы
+        self.tables = BalanceTables(balance)
+
+        # сообщения игроку (в игре — toast.show), в headless — никуда
+        self.notify = notify or (lambda text, duration=2000: None)
+        # журнал изменений (в игре — SaveManager.append), по умолчанию выключен
+        self.journal = None
+
+        # фиксированный шаг: производство в balance.json задано на тик
+        sim_cfg = self.balance.get("simulation", {})
+        self.clock = TickClock(
+            tick_rate=sim_cfg.get("tick_rate", 60),
+            max_catch_up=sim_cfg.get("max_catch_up_ticks", 15)
+        )
+
+        self.state = GameState()
+        # таймеры симуляции (потребление, события) — во времени тиков
+        self.timers = Scheduler()
+        self.resources = ResourceManager(self.balance, tables=self.tables)
+        self.buildings = BuildingManager(self.balance, cell_size, tables=self.tables)
+        if sim_cfg.get("vectorized_production", False):
+            self.buildings.enable_vectorized()
+        self.quests = QuestManager()
+
+        # случайные события пока выключены в игре — включаются флагом
+        self.events = EventManager()
+        self.events_enabled = events_enabled
+
+        self.setup_quests()
+        self._schedule_timers()
+
+        if save_data:
+            self.load_save_data(save_data)
+
+    @classmethod
+    def from_files(cls, balance_path="balance.json", save_path="save.json", **kwargs):
+        save_data = None
+        if save_path and os.path.exists(save_path):
+            with open(save_path, "r", encoding="utf-8") as f:
+                save_data = json.load(f)
+        return cls(load_balance(balance_path), save_data, **kwargs)
+
+    # ---------- квесты ----------
+
+    def setup_quests(self):
+        # задания из balance.json; проверяются по изменениям, не каждый тик
+        self.quests.setup(self.tables.quests, self.resources, self.buildings)
+
+    def _schedule_timers(self):
+        # потребление глобальное (еда/вода населением) — раз в consumption_interval
+        self.consumption = self.timers.every(self.state.consumption_interval, self._consume_by_population)
+        self.timers.every(self.events.interval, self._roll_event)
+
+    def _roll_event(self):
+        # случайные события пока выключены в игре — включаются флагом
+        if self.events_enabled:
+            self.events.roll(self.resources.values, self.timers)
+
+    # ---------- действия игрока ----------
+
+    def mine(self):
+        """
+        Клик по земле: добыча материалов. Возвращает прирост.
+        """
+        gain = self.tables.click_gain
+        self.resources.add("materials", gain)
+
+        if self.state.first_goal and self.resources.get("materials") >= 5:
+            self.state.first_goal = False
+            self.state.show_hint = False
+            self.notify("Вы добыли первые материалы!", 2500)
+        return gain
+
+    def place_building(self, gx, gy, btype):
+        b = self.buildings.place_building(gx, gy, btype)
+        self._journal({"op": "place", "type": btype, "grid_x": gx, "grid_y": gy})
+        return b
+
+    def try_upgrade(self, building):
+        if building is None:
+            return False
+        cost = self.buildings.get_upgrade_cost(building)
+        if not self.resources.can_afford_cost(cost):
+            self.notify("Недостаточно ресурсов для улучшения!", 2000)
+            return False
+        self.resources.pay_cost(cost)
+        self.buildings.upgrade_building(building)
+        self._journal({"op": "upgrade", "grid_x": building.grid_x, "grid_y": building.grid_y, "level": building.level})
+        self.notify("Здание улучшено!", 2000)
+        return True
+
+    def _journal(self, record):
+        if self.journal:
+            self.journal(record)
+
+    # ---------- шаг симуляции ----------
+
+    def update(self, dt):
+        """
+        Вызывается раз в кадр с реальным dt (мс). Сама симуляция
+        идёт фиксированными тиками, пропущенные тики — одной пачкой.
+        """
+        if not self.state.is_playing():
+            return
+
+        ticks = self.clock.advance(dt)
+        if ticks:
+            self.run_ticks(ticks)
+
+    def run_ticks(self, ticks):
+        if not self.state.is_playing():
+            return
+
+        sim_dt = ticks * self.clock.tick_ms
+
+        # потребление населением и события — истёкшие таймеры этого такта
+        self.timers.advance(sim_dt)
+
+        # производство от зданий
+        with profiler.scope("buildings.produce_all"):
+            self.buildings.produce_all(self.resources, ticks)
+
+        # задания — только если поменялось то, от чего они зависят
+        self.quests.on_resources_changed(self.resources.ledger.take_changed())
+
+    def advance_offline(self, elapsed_ms):
+        """
+        Время, пока игра была закрыта: тот же результат, что и
+        update() на elapsed_ms, но аналитически, без прогона тиков.
+        Квесты и события за это время не крутятся.
+        """
+        if not self.state.is_playing() or elapsed_ms <= 0:
+            return None
+        return OfflineProgress(self).run(elapsed_ms)
+
+    def _consume_by_population(self):
+        pop = self.resources.get("population")
+        self.resources.add("food", -0.5 * pop)
+        self.resources.add("water", -0.5 * pop)
+
+        if self.resources.get("food") <= 0 or self.resources.get("water") <= 0:
+            self.resources.add("population", -1)
+            if self.resources.get("population") < 0:
+                self.resources.set("population", 0)
+            self.notify("Люди умирают от голода или жажды...", 3000)
+            if self.resources.get("population") <= 0:
+                self.state.set_dead()
+
+    # ---------- сохранение ----------
+
+    def to_save_data(self):
+        return {
+            "resources": self.resources.snapshot(),  # все ресурсы (копия — снимок)
+            "buildings": self.buildings.to_save_data(),  # все здания
+            # можно добавить любое доп. состояние:
+            "state": self._state_data()
+        }
+
+    def _state_data(self):
+        return {
+            "first_goal": getattr(self.state, "first_goal", True),
+            "show_hint": getattr(self.state, "show_hint", True),
+            # для оффлайн-прогресса при следующей загрузке
+            "saved_at": time.time(),
+        }
+
+    def checkpoint_data(self):
+        """Только ресурсы и простое состояние — для журнала."""
+        return self.resources.snapshot(), self._state_data()
+
+    def load_save_data(self, data):
+        # ресурсы
+        resources_data = data.get("resources", {})
+        for rid, value in resources_data.items():
+            self.resources.set(rid, value)
+
+        # здания
+        buildings_data = data.get("buildings", [])
+        self.buildings.load_from_save_data(buildings_data)
+
+        # простое состояние
+        state_data = data.get("state", {})
+        if hasattr(self.state, "first_goal"):
+            self.state.first_goal = state_data.get("first_goal", True)
+        if hasattr(self.state, "show_hint"):
+            self.state.show_hint = state_data.get("show_hint", True)
+
+    def reset(self):
+        self.state.reset()
+        self.clock.reset()
+        self.resources.reset()
+        self.buildings.reset()
+        self.quests.reset()
+        self.events = EventManager()
+        self.timers.clear()
+        self._schedule_timers()
@@ -0,0 +1,43 @@
+# core/tick_clock.py
+
+
+class TickClock:
+    """
+    Фиксированный шаг симуляции. Кадры приходят с любым dt, а симуляция
+    всегда идёт тиками по 1000 / tick_rate мс:
+
+        ticks = clock.advance(dt)   # сколько тиков надо прогнать
+
+    Если кадр был долгим, накопленные тики отдаются одной пачкой, но не
+    больше max_catch_up — остаток выбрасывается, чтобы фриз не раскрутил
+    «спираль смерти».
+    """
+    def __init__(self, tick_rate=60, max_catch_up=15):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000.0 / tick_rate
+        self.max_catch_up = max_catch_up
+
+        self.accumulator = 0.0
+        self.total_ticks = 0
+        self.dropped_ticks = 0
+
+    def advance(self, dt):
+        self.accumulator += dt
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_catch_up:
+            self.dropped_ticks += ticks - self.max_catch_up
+            ticks = self.max_catch_up
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_ms
+        self.total_ticks += ticks
+        return ticks
+
+    def alpha(self):
+        """Доля следующего тика — для интерполяции при отрисовке."""
+        return self.accumulator / self.tick_ms
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.total_ticks = 0
+        self.dropped_ticks = 0
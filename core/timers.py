@@ -0,0 +1,97 @@
+# core/timers.py
+import heapq
+import itertools
+
+
+class Timer:
+    """Запись в Scheduler. cancel() — снять таймер (из кучи уходит лениво)."""
+    __slots__ = ("deadline", "interval", "callback", "cancelled")
+
+    def __init__(self, deadline, interval, callback):
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Все таймеры одного времени в одной куче по сроку.
+
+    Подсистема не считает свой таймер каждый кадр, а регистрирует срок:
+    after(ms, fn) — один раз, every(ms, fn) — повторять. advance(dt)
+    сдвигает часы и вызывает только то, что истекло, — стоимость кадра
+    зависит от числа сработавших таймеров, а не зарегистрированных.
+
+    Часов двое: у SimulationEngine — время симуляции (тики, без pygame),
+    у Game — время кадров для UI (тосты, частицы, анимации).
+    """
+    def __init__(self):
+        self.now = 0
+        self._heap = []
+        # при равном сроке — в порядке регистрации
+        self._seq = itertools.count()
+
+    def after(self, delay, callback):
+        return self._push(Timer(self.now + delay, None, callback))
+
+    def every(self, interval, callback, first=None):
+        """Повтор раз в interval мс; первый раз — через first (по умолчанию interval)."""
+        if interval <= 0:
+            raise ValueError("интервал повтора должен быть больше нуля")
+        delay = interval if first is None else first
+        return self._push(Timer(self.now + delay, interval, callback))
+
+    def _push(self, timer):
+        heapq.heappush(self._heap, (timer.deadline, next(self._seq), timer))
+        return timer
+
+    def remaining(self, timer):
+        return max(0, timer.deadline - self.now)
+
+    def next_deadline(self):
+        """Срок ближайшего живого таймера или None."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def advance(self, dt):
+        """Сдвинуть часы на dt мс и вызвать всё, что истекло, по порядку сроков."""
+        self.now += dt
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= self.now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                # повтор ставим до вызова — колбэк может его отменить
+                timer.deadline += timer.interval
+                self._push(timer)
+            else:
+                timer.cancelled = True
+            timer.callback()
+            fired += 1
+        return fired
+
+    def cancel_all(self):
+        """Снять все таймеры; часы идут дальше (сроки вида now + N остаются верными)."""
+        for _, _, timer in self._heap:
+            timer.cancelled = True
+        self._heap = []
+
+    def clear(self):
+        self.cancel_all()
+        self.now = 0
+
+    def __bool__(self):
+        # без этого пустой Scheduler ложен (см. __len__), и `timers or Scheduler()`
+        # молча подменяет общие часы своими
+        return True
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self._heap if not timer.cancelled)
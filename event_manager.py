@@ -1,30 +1,27 @@
 # event_manager.py
 import random
-import pygame
+
+from ui.text_cache import render_text
 
 class EventManager:
+    """
+    Случайные события. Таймеры — в общем Scheduler движка:
+    раз в interval движок вызывает roll(), конец события — after().
+    """
     def __init__(self):
-        self.timer = 0
         self.interval = 20000  # каждые 20 секунд шанс события
+        self.duration = 6000   # событие висит 6 секунд
         self.active_event = None
-        self.event_timer = 0
-
-    def update(self, dt, resources):
-        self.timer += dt
-
-        # если нет активного события — шанс вызвать новое
-        if self.timer >= self.interval and not self.active_event:
-            self.timer = 0
-            if random.random() < 0.25:  # 25% шанс
-                self.start_event(resources)
+        self._end_timer = None
 
-        # если событие активно — уменьшаем таймер
+    def roll(self, resources, timers):
+        # пока событие активно — новое не начинается
         if self.active_event:
-            self.event_timer -= dt
-            if self.event_timer <= 0:
-                self.active_event = None
+            return
+        if random.random() < 0.25:  # 25% шанс
+            self.start_event(resources, timers)
 
-    def start_event(self, resources):
+    def start_event(self, resources, timers=None):
         events = [
             ("Песчаная буря! Производство снижено.", -0.5),
             ("Поломка оборудования! Потеря материалов.", -5),
@@ -32,10 +29,15 @@ class EventManager:
         ]
         text, effect = random.choice(events)
         self.active_event = text
-        self.event_timer = 6000  # 6 секунд
+        if timers is not None:
+            self._end_timer = timers.after(self.duration, self.end_event)
         resources["materials"] = max(0, resources["materials"] + effect)
 
+    def end_event(self):
+        self.active_event = None
+        self._end_timer = None
+
     def draw(self, screen, font, width):
         if self.active_event:
-            txt = font.render(self.active_event, True, (255, 120, 120))
+            txt = render_text(font, self.active_event, (255, 120, 120))
             screen.blit(txt, (width//2 - txt.get_width()//2, 60))
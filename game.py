@@ -1,34 +1,49 @@
 # game.py
 import pygame
 import os
-import json
+import time
 
-from core.game_state import GameState
-from core.resource_manager import ResourceManager
+from core.profiler import profiler
 from core.save_manager import SaveManager
+from core.simulation import SimulationEngine, load_balance
+from core.timers import Scheduler
 
 from worlds.grid import Grid
-from worlds.building_manager import BuildingManager
 
 from ui.shop import Shop
+from ui.dirty_rects import DirtyRects
+from ui.text_cache import render_text
+from ui.atlas import load_image
+from ui.fonts import get_font
+from ui.particles import ParticlePool
+from settings import AUTOSAVE_INTERVAL, SAVE_BACKUPS, JOURNAL_COMPACT_EVERY
+from settings import OFFLINE_PROGRESS, OFFLINE_PROGRESS_MAX_MS, PARTICLE_CAP
+from settings import WORLD_COLS, WORLD_ROWS, CAMERA_PAN_SPEED, ZOOM_LEVELS
 from toast import ToastManager
-from quest_manager import QuestManager
-
 
 
 class Game:
-    def __init__(self, screen, width, height):
+    def __init__(self, screen, width, height, dirty_rects=False):
         self.save_manager = SaveManager("save.json")
 
         self.screen = screen
         self.width = width
         self.height = height
 
+        # dirty-rect режим: draw() возвращает изменившиеся прямоугольники
+        self.dirty_rects_enabled = dirty_rects
+        self.dirty = DirtyRects(width, height)
+        self._scene_key = None
+        self._hud_key = None
+        self._hud_rect_drawn = None
+        self._hover_drawn = None
+        self._particle_rects = []
+
         self.clock = pygame.time.Clock()
         # при гибели
         # кнопка рестарта при гибели
         restart_path = "assets/ui/btn_new_game.png"  # или твой путь
-        self.restart_img = pygame.image.load(restart_path).convert_alpha()
+        self.restart_img = load_image(restart_path)
 
         # hover‑версия (если хочешь подсветку)
         self.restart_img_hover = self.restart_img.copy()
@@ -49,16 +64,15 @@ class Game:
 
         # ---- фон ----
         bg_path = os.path.join("assets", "backgrounds", "background_mars.png")
-        self.background = pygame.image.load(bg_path).convert()
-        self.background = pygame.transform.scale(self.background, (self.width, self.height))
+        self.background = load_image(bg_path, (self.width, self.height), alpha=False)
 
-        # ---- шрифты ----
-        self.font = pygame.font.SysFont("arial", 20)
-        self.hint_font = pygame.font.SysFont("arial", 24, bold=True)
-        self.quest_font = pygame.font.SysFont("arial", 22, bold=True)
+        # ---- шрифты (assets/fonts, общий кэш — без SysFont) ----
+        self.font = get_font("ui", 20)
+        self.hint_font = get_font("ui", 24, bold=True)
+        self.quest_font = get_font("ui", 22, bold=True)
         # ---- кнопка выхода в главное меню ----
         exit_path = os.path.join("assets", "ui", "exit_button.png")
-        self.exit_img = pygame.image.load(exit_path).convert_alpha()
+        self.exit_img = load_image(exit_path)
 
         # создаём слегка подсвеченную версию для hover
         self.exit_img_hover = self.exit_img.copy()
@@ -74,14 +88,31 @@ class Game:
         # ---- баланс ----
         self.balance = self.load_balance()
 
-        # ---- core ----
-        self.state = GameState()
-        self.resources = ResourceManager(self.balance)
-        self.save_manager = SaveManager()
+        # ---- core: вся симуляция живёт в движке, Game только рисует ----
+        # часы UI: тосты, частицы, анимации, вспышка магазина (core.timers)
+        self.timers = Scheduler()
+        self.toast = ToastManager(self.font, self.timers)
+        self.engine = SimulationEngine(self.balance, cell_size=self.cell_size, notify=self.toast.show)
+        self.state = self.engine.state
+        self.resources = self.engine.resources
+        self.resources.render_text = render_text
+        self.resources.load_icons(os.path.join("assets", "icons"))
+        self.quests = self.engine.quests
+        self.quests.font = self.quest_font
+        self.save_manager = SaveManager(backups=SAVE_BACKUPS)
+        self.engine.journal = self.save_manager.append
+        self.autosave_timer = 0
 
         # ---- мир ----
-        self.grid = Grid(self.width, self.height, self.cell_size, self.shop_width)
-        self.buildings = BuildingManager(self.balance, self.cell_size)
+        self.grid = Grid(
+            self.width, self.height, self.cell_size, self.shop_width,
+            WORLD_COLS, WORLD_ROWS, zoom_levels=ZOOM_LEVELS
+        )
+        # прокрутка мира перетаскиванием правой/средней кнопкой
+        self.dragging = False
+        self.buildings = self.engine.buildings
+        self.buildings.timers = self.timers
+        self.buildings.load_sprites(os.path.join("assets", "buildings"))
 
         # ---- UI ----
         btn_img = self._load_button_image(os.path.join("assets", "ui", "btn_shop.png"))
@@ -91,17 +122,15 @@ class Game:
             resource_manager=self.resources,
             panel_width=self.shop_width,
             screen_width=self.width,
-            btn_image=btn_img
+            btn_image=btn_img,
+            timers=self.timers
         )
         self.shop.layout_buttons()
 
-        self.toast = ToastManager(self.font)
-        self.quests = QuestManager(self.quest_font)
+        self.click_particles = ParticlePool(self.font, self.timers, capacity=PARTICLE_CAP)
 
-        self.click_particles = []
-
-        self.setup_quests()
-        self.load_game()
+        # сохранение здесь не грузим: меню решает — load_game() («продолжить»,
+        # один раз, с оффлайн-прогрессом) или reset_game() («новая игра»)
 
         # окно апгрейда
         self.upgrade_window_open = False
@@ -125,40 +154,31 @@ class Game:
 
         x, y, w, h = self.upgrade_rect
 
-        title = self.font.render(f"Улучшение: {b.type}", True, (255, 220, 120))
+        title = render_text(self.font, f"Улучшение: {b.type}", (255, 220, 120))
         self.screen.blit(title, (x + 20, y + 20))
 
-        lvl_text = self.font.render(f"Уровень: {b.level}", True, (255, 255, 255))
+        lvl_text = render_text(self.font, f"Уровень: {b.level}", (255, 255, 255))
         self.screen.blit(lvl_text, (x + 20, y + 70))
 
         cost = self.buildings.get_upgrade_cost(b)
         cost_str = ", ".join(f"{rid}: {int(val)}" for rid, val in cost.items())
-        cost_text = self.font.render(f"Стоимость: {cost_str}", True, (200, 200, 120))
+        cost_text = render_text(self.font, f"Стоимость: {cost_str}", (200, 200, 120))
         self.screen.blit(cost_text, (x + 20, y + 110))
 
         self.upgrade_btn = pygame.Rect(x + 100, y + 180, 200, 50)
         pygame.draw.rect(self.screen, (80, 120, 80), self.upgrade_btn, border_radius=8)
         pygame.draw.rect(self.screen, (255, 255, 255), self.upgrade_btn, 2, border_radius=8)
 
-        btn_text = self.font.render("Улучшить", True, (255, 255, 255))
+        btn_text = render_text(self.font, "Улучшить", (255, 255, 255))
         self.screen.blit(btn_text, (self.upgrade_btn.x + 40, self.upgrade_btn.y + 10))
 
     def load_balance(self):
-        if not os.path.exists("balance.json"):
-            print("Внимание: нет balance.json")
-            return {}
-        try:
-            with open("balance.json", "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print("Ошибка чтения balance.json:", e)
-            return {}
+        return load_balance("balance.json")
 
     def _load_button_image(self, path):
         try:
             if path and os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                return img
+                return load_image(path)
         except Exception as e:
             print("Ошибка загрузки кнопки магазина:", path, e)
         surf = pygame.Surface((260, 64), pygame.SRCALPHA)
@@ -166,24 +186,14 @@ class Game:
         pygame.draw.rect(surf, (255, 255, 255), surf.get_rect(), 2)
         return surf
 
-    # ---------- квесты ----------
-
-    def setup_quests(self):
-        self.quests.add_quest(
-            "collect_5_materials",
-            "Добудьте 5 материалов, кликая по земле",
-            lambda: self.resources.get("materials") >= 5
-        )
-        self.quests.add_quest(
-            "build_solar",
-            "Постройте солнечную панель",
-            lambda: any(b.type == "solar_panel" for b in self.buildings.buildings)
-        )
-
     # ============================================================
     # Обработка событий
     # ============================================================
     def handle_event(self, event):
+        # окно перекрыли/развернули — картинку надо вывести целиком
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.invalidate()
+
         # hover для кнопки рестарта (когда колония мертва)
         if self.state.state == "dead":
             self.restart_hover = self.restart_btn_rect.collidepoint(
@@ -196,7 +206,26 @@ class Game:
                     return
             return
 
+        # прокрутка мира: правая или средняя кнопка + перетаскивание
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+            self.dragging = event.pos[0] < self.grid.view_width
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+            self.dragging = False
+
+        # зум: колесо — к точке под курсором, +/- — к центру поля
+        if event.type == pygame.MOUSEWHEEL:
+            pos = pygame.mouse.get_pos()
+            if pos[0] < self.grid.view_width and event.y:
+                self._zoom(1 if event.y > 0 else -1, pos)
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self._zoom(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self._zoom(-1)
+
         if event.type == pygame.MOUSEMOTION:
+            if self.dragging:
+                self.grid.pan(-event.rel[0], -event.rel[1])
             self.grid.update_hover(event.pos)
             self.shop.handle_mouse_motion(event.pos)
 
@@ -240,42 +269,25 @@ class Game:
                 return
 
             # 3. клик по зданию — открыть окно апгрейда
-            for b in self.buildings.buildings:
-                rect = pygame.Rect(
-                    b.grid_x * self.cell_size,
-                    b.grid_y * self.cell_size,
-                    self.cell_size,
-                    self.cell_size
-                )
-                if rect.collidepoint(mx, my):
-                    self.upgrade_target = b
-                    self.upgrade_window_open = True
-                    return
+            b = self.buildings.building_at(*self.grid.cell_at(event.pos))
+            if b:
+                self.upgrade_target = b
+                self.upgrade_window_open = True
+                return
 
             # 4. размещение выбранного здания
             gx, gy = self.grid.hover_cell
             if self.state.selected_building_type and self.buildings.can_place(
                     gx, gy, self.grid.cols, self.grid.rows
             ):
-                self.buildings.place_building(gx, gy, self.state.selected_building_type)
+                self.engine.place_building(gx, gy, self.state.selected_building_type)
                 self.state.selected_building_type = None
                 return
 
             # 5. добыча материалов
             if mx < self.width - self.shop_width:
-                gain = self.balance["click"]["materials_gain"]
-                self.resources.add("materials", gain)
-                self.click_particles.append({
-                    "x": mx,
-                    "y": my,
-                    "text": f"+{gain}",
-                    "life": 600
-                })
-
-                if self.state.first_goal and self.resources.get("materials") >= 5:
-                    self.state.first_goal = False
-                    self.state.show_hint = False
-                    self.toast.show("Вы добыли первые материалы!", 2500)
+                gain = self.engine.mine()
+                self.click_particles.spawn(mx, my, f"+{gain}")
 
     # ============================================================
     # Обновление
@@ -284,44 +296,134 @@ class Game:
         if not self.state.is_playing():
             return
 
-        self.quests.update()
-        self.toast.update(dt)
-        self.shop.update(dt)
+        # истёкшие таймеры UI: тосты, частицы, конец анимаций
+        self.timers.advance(dt)
+        self.click_particles.update()
         self.buildings.update_animations(dt)
 
-        # частицы
-        for p in self.click_particles:
-            p["y"] -= 0.05 * dt
-            p["life"] -= dt
-        self.click_particles = [p for p in self.click_particles if p["life"] > 0]
-
-        # потребление глобальное (еда/вода населением)
-        self.state.consumption_timer += dt
-        if self.state.consumption_timer >= self.state.consumption_interval:
-            self.state.consumption_timer = 0
-            pop = self.resources.get("population")
-            self.resources.add("food", -0.5 * pop)
-            self.resources.add("water", -0.5 * pop)
-
-            if self.resources.get("food") <= 0 or self.resources.get("water") <= 0:
-                self.resources.add("population", -1)
-                if self.resources.get("population") < 0:
-                    self.resources.set("population", 0)
-                self.toast.show("Люди умирают от голода или жажды...", 3000)
-                if self.resources.get("population") <= 0:
-                    self.state.set_dead()
-
-        # производство от зданий
-        self.buildings.produce_all(self.resources)
+        self._pan_with_keys(dt)
+
+        # квесты, потребление и производство
+        with profiler.scope("engine.update"):
+            self.engine.update(dt)
+
+        self.autosave_timer += dt
+        if self.autosave_timer >= AUTOSAVE_INTERVAL:
+            self.autosave_timer = 0
+            self.autosave()
+
+    def _zoom(self, step, anchor=None):
+        if self.grid.zoom_by(step, anchor):
+            # спрайты нового уровня — сейчас, а не в цикле отрисовки
+            self.buildings.prepare_zoom(self.grid.cell_px)
+
+    def _pan_with_keys(self, dt):
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        if dx or dy:
+            self.grid.pan(dx * CAMERA_PAN_SPEED * dt, dy * CAMERA_PAN_SPEED * dt)
 
     # ============================================================
     # Отрисовка
     # ============================================================
+    def invalidate(self):
+        """Следующий кадр рисуется и выводится целиком."""
+        self.dirty.invalidate()
+
     def draw(self):
+        """
+        Рисует кадр. Возвращает None, если экран надо вывести целиком
+        (pygame.display.flip), иначе список изменившихся прямоугольников
+        для pygame.display.update(rects) — возможно, пустой.
+        """
+        if not self.dirty_rects_enabled:
+            self._draw_scene()
+            return None
+
+        self._collect_dirty_rects()
+        rects = self.dirty.pop()
+        # окно апгрейда и экран смерти — целиком: под set_clip pygame
+        # теряет куски рамки draw.rect(..., 2, border_radius)
+        if rects is None or self.upgrade_window_open or self.state.state == "dead":
+            self._draw_scene()
+            return None
+        if not rects:
+            return rects
+
+        # сцена — отдельным проходом на каждую группу изменений,
+        # а не на общую рамку (HUD сверху + магазин справа — почти весь экран)
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self._draw_scene()
+        self.screen.set_clip(None)
+        return rects
+
+    def _collect_dirty_rects(self):
+        # крупные перемены (окна, смерть, квест, выбор здания) — полный кадр
+        quest = self.quests.active_quest
+        scene_key = (
+            self.state.state,
+            self.state.selected_building_type,
+            self.state.show_hint,
+            self.upgrade_window_open,
+            id(self.upgrade_target),
+            self.restart_hover,
+            quest["id"] if quest else None,
+            # сдвиг камеры или зум — всё поле поехало
+            self.grid.camera.offset,
+            self.grid.zoom_index,
+        )
+        if scene_key != self._scene_key:
+            self._scene_key = scene_key
+            self.invalidate()
+
+        # ресурсы сверху: полоска пересобирается сама, смотрим на её версию
+        hud_rect = self.resources.hud_rect(self.font, self.width)
+        if self.resources.hud_version != self._hud_key:
+            self._hud_key = self.resources.hud_version
+            self.dirty.add(self._hud_rect_drawn)
+            self.dirty.add(hud_rect)
+            self._hud_rect_drawn = hud_rect
+
+        # магазин и тосты
+        self.dirty.add(self.shop.dirty_rect(self.height))
+        self.dirty.add(self.toast.dirty_rect(self.width, self.height))
+
+        # подсветка клетки под курсором
+        hover = self.grid.hover_cell if self.state.selected_building_type else None
+        if hover != self._hover_drawn:
+            if self._hover_drawn:
+                self.dirty.add(self.grid.cell_rect(*self._hover_drawn))
+            if hover:
+                self.dirty.add(self.grid.cell_rect(*hover))
+            self._hover_drawn = hover
+
+        # здания с анимацией спавна
+        for gx, gy in self.buildings.changed_cells:
+            self.dirty.add(self.grid.cell_rect(gx, gy))
+        self.buildings.changed_cells = []
+
+        # частицы: где были и где стали
+        rects = self.click_particles.rects()
+        for r in self._particle_rects:
+            self.dirty.add(r)
+        for r in rects:
+            self.dirty.add(r)
+        self._particle_rects = rects
+
+    def _draw_scene(self):
         self.screen.blit(self.background, (0, 0))
 
-        self.grid.draw(self.screen)
-        self.buildings.draw(self.screen)
+        with profiler.scope("grid.draw"):
+            self.grid.draw(self.screen)
+
+        # здания — только видимые чанки и только в пределах поля
+        clip = self.screen.get_clip()
+        self.screen.set_clip(clip.clip((0, 0, self.grid.view_width, self.grid.view_height)))
+        with profiler.scope("buildings.draw"):
+            self.buildings.draw(self.screen, self.grid.camera, self.grid.cell_px)
+        self.screen.set_clip(clip)
         self._draw_click_particles()
         self._draw_ui()
         # кнопка выхода
@@ -346,7 +448,7 @@ class Game:
             self.screen.blit(overlay, (0, 0))
 
             # текст
-            txt = self.font.render("Колония погибла...", True, (255, 80, 80))
+            txt = render_text(self.font, "Колония погибла...", (255, 80, 80))
             self.screen.blit(txt, (self.width // 2 - txt.get_width() // 2, self.height // 2 - 40))
 
             # кнопка рестарта
@@ -359,86 +461,28 @@ class Game:
 
             self._draw_upgrade_window()
     def _draw_click_particles(self):
-        for p in self.click_particles:
-            alpha = max(0, min(255, int(p["life"] / 600 * 255)))
-            surf = self.font.render(p["text"], True, (255, 255, 255))
-            surf.set_alpha(alpha)
-            self.screen.blit(surf, (p["x"], p["y"]))
+        self.click_particles.draw(self.screen)
 
     def _draw_ui(self):
         # ресурсы сверху
-        self.resources.draw_top_center(self.screen, self.font, self.width)
+        with profiler.scope("hud.draw"):
+            self.resources.draw_top_center(self.screen, self.font, self.width)
 
         # подсказка в начале
         if self.state.show_hint:
-            hint = self.hint_font.render("Кликай по земле, чтобы добыть материалы!", True, (255, 220, 120))
+            hint = render_text(self.hint_font, "Кликай по земле, чтобы добыть материалы!", (255, 220, 120))
             self.screen.blit(hint, (self.width // 2 - hint.get_width() // 2, self.height - 60))
 
         # магазин
-        self.shop.draw(self.screen, self.font, self.buildings)
+        with profiler.scope("shop.draw"):
+            self.shop.draw(self.screen, self.font, self.buildings)
 
     # ---------- апгрейд ----------
 
     def _try_upgrade_current(self):
         if not self.upgrade_target:
             return
-        cost = self.buildings.get_upgrade_cost(self.upgrade_target)
-        if not self.resources.can_afford_cost(cost):
-            self.toast.show("Недостаточно ресурсов для улучшения!", 2000)
-            return
-        self.resources.pay_cost(cost)
-        self.buildings.upgrade_building(self.upgrade_target)
-        self.toast.show("Здание улучшено!", 2000)
-    # ---------- информация об апгрейде и производстве ----------
-
-    def get_building_cfg(self, building):
-        """
-        Безопасно достаём конфиг здания из balance.json.
-        """
-        return self.balance.get("buildings", {}).get(building.type, {})
-
-    def get_max_level(self, building):
-        """
-        Максимальный уровень здания из конфига. Если не задан — 1.
-        В balance.json для каждого здания можно прописать "max_level".
-        """
-        cfg = self.get_building_cfg(building)
-        return cfg.get("max_level", 1)
-
-    def get_production_info(self, building):
-        """
-        Возвращает словарь с данными по производству:
-        {
-            "current": {rid: value},   # текущее производство на этом уровне
-            "next":    {rid: value},   # производство на следующем уровне
-            "gain":    {rid: value},   # прирост при апгрейде
-            "max_level": int
-        }
-        Если у здания нет production — вернёт пустые словари.
-        """
-        cfg = self.get_building_cfg(building)
-        base_prod = cfg.get("production", {})
-        mult = cfg.get("level_multiplier", 1.0)
-
-        current = {}
-        next_ = {}
-        gain = {}
-
-        for rid, amount in base_prod.items():
-            current_val = amount * (mult ** (building.level - 1))
-            next_val = amount * (mult ** (building.level))
-            current[rid] = current_val
-            next_[rid] = next_val
-            gain[rid] = next_val - current_val
-
-        max_level = self.get_max_level(building)
-
-        return {
-            "current": current,
-            "next": next_,
-            "gain": gain,
-            "max_level": max_level
-        }
+        self.engine.try_upgrade(self.upgrade_target)
 
     def draw_upgrade_window(self):
         if not self.upgrade_window_open or not self.upgrade_target:
@@ -458,17 +502,17 @@ class Game:
         x, y, w, h = self.upgrade_rect
 
         # заголовок
-        title = self.font.render(f"Улучшение: {b.type}", True, (255, 220, 120))
+        title = render_text(self.font, f"Улучшение: {b.type}", (255, 220, 120))
         self.screen.blit(title, (x + 20, y + 20))
 
         # уровень
-        lvl_text = self.font.render(f"Уровень: {b.level}", True, (255, 255, 255))
+        lvl_text = render_text(self.font, f"Уровень: {b.level}", (255, 255, 255))
         self.screen.blit(lvl_text, (x + 20, y + 70))
 
         # стоимость
         cost = self.buildings.get_upgrade_cost(b)
         cost_str = ", ".join(f"{rid}: {int(val)}" for rid, val in cost.items())
-        cost_text = self.font.render(f"Стоимость: {cost_str}", True, (200, 200, 120))
+        cost_text = render_text(self.font, f"Стоимость: {cost_str}", (200, 200, 120))
         self.screen.blit(cost_text, (x + 20, y + 110))
 
         # кнопка улучшения
@@ -476,27 +520,37 @@ class Game:
         pygame.draw.rect(self.screen, (80, 120, 80), self.upgrade_btn, border_radius=8)
         pygame.draw.rect(self.screen, (255, 255, 255), self.upgrade_btn, 2, border_radius=8)
 
-        btn_text = self.font.render("Улучшить", True, (255, 255, 255))
+        btn_text = render_text(self.font, "Улучшить", (255, 255, 255))
         self.screen.blit(btn_text, (self.upgrade_btn.x + 40, self.upgrade_btn.y + 10))
 
     # ---------- сохранения ----------
 
     def save_game(self):
         """
-        Сохранение текущего состояния игры в save.json через SaveManager.
+        Сохранение при выходе: контрольная точка в журнал (размер не зависит
+        от колонии). Полный save.json пишется, только если его ещё нет.
         """
-        data = {
-            "resources": self.resources.values,  # все ресурсы
-            "buildings": self.buildings.to_save_data(),  # все здания
-            # можно добавить любое доп. состояние:
-            "state": {
-                "first_goal": getattr(self.state, "first_goal", True),
-                "show_hint": getattr(self.state, "show_hint", True),
-            }
-        }
-        self.save_manager.save(data)
+        if self.save_manager.has_snapshot():
+            self.save_manager.checkpoint(*self.engine.checkpoint_data())
+            self.save_manager.wait()
+        else:
+            self.save_manager.save(self.engine.to_save_data())
         print("Игра сохранена")
 
+    def autosave(self):
+        """
+        Обычно — контрольная точка в журнал. Когда журнал разросся
+        (или снимка ещё нет) — полный снимок: снимается на игровом потоке,
+        сериализуется и пишется в фоне, журнал после этого ужимается.
+        """
+        t0 = time.perf_counter()
+        if self.save_manager.has_snapshot() and self.save_manager.journal_entries < JOURNAL_COMPACT_EVERY:
+            self.save_manager.checkpoint(*self.engine.checkpoint_data())
+            print(f"Автосохранение (журнал): {(time.perf_counter() - t0) * 1000:.1f} мс")
+            return
+        data = self.engine.to_save_data()
+        self.save_manager.save_async(data, snapshot_ms=(time.perf_counter() - t0) * 1000.0)
+
     def load_game(self):
         """
         Загрузка состояния игры из save.json. Если файла нет — просто выходим.
@@ -506,33 +560,39 @@ class Game:
             print("Сохранения нет, загрузка отменена")
             return
 
-        # ресурсы
-        resources_data = data.get("resources", {})
-        for rid, value in resources_data.items():
-            self.resources.set(rid, value)
+        self.engine.load_save_data(data)
+        self._apply_offline_progress(data.get("state", {}).get("saved_at"))
+        self.invalidate()
 
-        # здания
-        buildings_data = data.get("buildings", [])
-        self.buildings.load_from_save_data(buildings_data)
+        print("Игра загружена")
 
-        # простое состояние
-        state_data = data.get("state", {})
-        if hasattr(self.state, "first_goal"):
-            self.state.first_goal = state_data.get("first_goal", True)
-        if hasattr(self.state, "show_hint"):
-            self.state.show_hint = state_data.get("show_hint", True)
+    def _apply_offline_progress(self, saved_at):
+        if not OFFLINE_PROGRESS or not saved_at:
+            return
+        elapsed_ms = min((time.time() - saved_at) * 1000.0, OFFLINE_PROGRESS_MAX_MS)
+        if elapsed_ms < 1000:
+            return
 
-        print("Игра загружена")
+        report = self.engine.advance_offline(elapsed_ms)
+        if not report:
+            return
+        print(f"Оффлайн-прогресс: {report['elapsed_ms'] / 1000:.0f} с за {report['compute_ms']:.1f} мс")
+
+        minutes = int(report["elapsed_ms"] // 60000)
+        if report["dead"]:
+            self.toast.show("Пока вас не было, колония погибла", 4000)
+        elif minutes:
+            self.toast.show(f"Пока вас не было ({minutes} мин), колония работала", 4000)
 
     def reset_game(self):
-        self.save_manager.reset()
-        self.state.reset()
+        # колбэки UI старой игры (тосты, частицы, анимации) в новую не переносим
+        self.timers.cancel_all()
+        self.toast.clear()
 
-        # ✅ НЕ создаём новый ResourceManager — обновляем старый
-        new_res = ResourceManager(self.balance)
-        self.resources.values = new_res.values.copy()
+        self.save_manager.reset()
 
-        self.buildings.buildings = []
+        # ✅ НЕ пересоздаём движок — Shop и Game держат ссылки на его части
+        self.engine.reset()
 
         self.shop._init_items()
         self.shop.layout_buttons()
@@ -540,3 +600,5 @@ class Game:
         self.click_particles.clear()
         self.upgrade_window_open = False
         self.upgrade_target = None
+        self.autosave_timer = 0
+        self.invalidate()
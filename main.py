@@ -1,9 +1,20 @@
+import time
+
+# отсчёт для «время до первого кадра»
+START_TIME = time.perf_counter()
+
 import pygame
 import os
 
 from ui.menu import MainMenu
 from game import Game
-import os, sys
+from settings import DIRTY_RECTS, PROFILER_TRACE_PATH
+from ui.atlas import open_atlas, game_images
+from ui.asset_loader import game_assets
+from core.simulation import load_balance
+from core.profiler import profiler
+from ui.fonts import get_font
+from ui.profiler_overlay import ProfilerOverlay
 
 pygame.init()
 pygame.mixer.init()
@@ -13,11 +24,33 @@ WIDTH, HEIGHT = 1536, 1024
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Martian Colony")
 
+# запечённый атлас картинок (python -m ui.atlas); без него — по файлу
+atlas = open_atlas()
+
 clock = pygame.time.Clock()
 
-# --- меню и игра ---
+# --- меню сразу, картинки игры — в фоне, пока игрок в меню ---
 menu = MainMenu(screen, WIDTH, HEIGHT)
-game = Game(screen, WIDTH, HEIGHT)
+game_assets.start([
+    (path, size) for path, size, _ in game_images(load_balance(), WIDTH, HEIGHT)
+    if not (atlas and atlas.has(path, size))
+])
+game = None
+first_frame = True
+
+# профайлер кадра: F3 — панель (и запись), F4 — Chrome trace
+profiler_overlay = ProfilerOverlay(profiler, get_font("ui", 16))
+
+
+def get_game():
+    """Game создаётся при первом входе; ждёт только недогруженные картинки."""
+    global game
+    if game is None:
+        t = time.perf_counter()
+        game = Game(screen, WIDTH, HEIGHT, dirty_rects=DIRTY_RECTS)
+        print(f"Игра готова за {(time.perf_counter() - t) * 1000:.0f} мс "
+              f"(фоновая загрузка {game_assets.progress():.0%})")
+    return game
 
 # --- музыка меню ---
 if os.path.exists("assets/sounds/game_music.mp3.mp3"):
@@ -30,8 +63,18 @@ running = True
 
 while running:
     dt = clock.tick(60)
+    profiler.frame_begin()
 
     for event in pygame.event.get():
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler_overlay.toggle()
+            # под скрытой панелью сцену надо перерисовать
+            if game is not None:
+                game.invalidate()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.enabled:
+            count = profiler.export_chrome_trace(PROFILER_TRACE_PATH)
+            print(f"Профиль: {count} событий -> {PROFILER_TRACE_PATH}")
+
         if event.type == pygame.QUIT:
             # при выходе можно сохранить игру, если мы в игре
             if state == "game":
@@ -50,7 +93,7 @@ while running:
                     pygame.mixer.music.load("assets/sounds/game_music.mp3")
                     pygame.mixer.music.play(-1)
 
-                game.reset_game()
+                get_game().reset_game()
                 state = "game"
 
             elif result == "restart":
@@ -58,7 +101,7 @@ while running:
                     pygame.mixer.music.load("assets/sounds/game_music.mp3")
                     pygame.mixer.music.play(-1)
 
-                game.reset_game()
+                get_game().reset_game()
                 state = "game"
 
             elif result == "continue":
@@ -66,14 +109,15 @@ while running:
                     pygame.mixer.music.load("assets/sounds/game_music.mp3")
                     pygame.mixer.music.play(-1)
 
-                game.load_game()
+                get_game().load_game()
                 state = "game"
 
         # -------------------------------
         # ИГРА
         # -------------------------------
         elif state == "game":
-            result = game.handle_event(event)
+            with profiler.scope("game.handle_event"):
+                result = game.handle_event(event)
 
             if result == "exit_to_menu":
                 # сохраняем игру перед выходом
@@ -89,14 +133,32 @@ while running:
     # -------------------------------
     # ОТРИСОВКА
     # -------------------------------
+    # None — вывести кадр целиком, список — только изменившиеся места
+    dirty = None
+
     if state == "menu":
         menu.update(dt)
-        menu.draw(has_save=os.path.exists("save.json"))
+        menu.draw(has_save=os.path.exists("save.json"), load_progress=game_assets.progress())
 
     elif state == "game":
-        game.update(dt)
-        game.draw()
-
-    pygame.display.flip()
+        with profiler.scope("game.update"):
+            game.update(dt)
+        with profiler.scope("game.draw"):
+            dirty = game.draw()
+
+    panel = profiler_overlay.draw(screen)
+    if panel and dirty is not None:
+        dirty.append(panel)
+
+    with profiler.scope("display.flip"):
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+    profiler.frame_end()
+
+    if first_frame:
+        first_frame = False
+        print(f"Первый кадр через {(time.perf_counter() - START_TIME) * 1000:.0f} мс")
 
 pygame.quit()
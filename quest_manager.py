@@ -1,34 +1,103 @@
 # quest_manager.py
-import pygame
+from ui.text_cache import render_text
+
 
 class QuestManager:
-    def __init__(self, font):
+    """
+    Задания по очереди. Условия задаются в balance.json ("quests") и
+    собираются в проверку + подписки: активное задание проверяется только
+    когда поменялся ресурс или здание, от которых оно зависит,
+    а не каждый кадр.
+
+    add_quest(id, text, condition) без deps по-прежнему работает —
+    такое условие проверяется при любом изменении.
+    """
+    def __init__(self, font=None):
         self.font = font
         self.active_quest = None
         self.completed = []
         self.queue = []
 
-    def add_quest(self, quest_id, text, condition):
+        self.definitions = []
+        self.resources = None
+        self.buildings = None
+
+    def setup(self, definitions, resources, buildings):
+        """Задания из balance.json поверх ResourceManager и BuildingManager."""
+        self.definitions = list(definitions)
+        self.resources = resources
+        self.buildings = buildings
+        buildings.listeners.append(self.on_buildings_changed)
+        self.reset()
 
+    def reset(self):
+        self.active_quest = None
+        self.completed = []
+        self.queue = []
+        for quest in self.definitions:
+            condition, deps = self._compile(quest)
+            self.add_quest(quest["id"], quest["text"], condition, deps)
+
+    def _compile(self, quest):
+        """(условие, зависимости) — зависимости: {("resource", id) / ("building", type)}."""
+        kind = quest["type"]
+        if kind == "resource":
+            rid, amount = quest["resource"], quest["at_least"]
+            return (lambda: self.resources.get(rid) >= amount), {("resource", rid)}
+        btype = quest["building"]
+        if kind == "building_count":
+            count = quest["at_least"]
+            return (lambda: self.buildings.count(btype) >= count), {("building", btype)}
+        level = quest["level"]
+        return (lambda: self.buildings.max_levels.get(btype, 0) >= level), {("building", btype)}
+
+    def add_quest(self, quest_id, text, condition, deps=None):
         self.queue.append({
             "id": quest_id,
             "text": text,
-            "condition": condition
+            "condition": condition,
+            "deps": deps
         })
 
         if self.active_quest is None:
+            self._next()
+
+    def _next(self):
+        # следующее задание может быть уже выполнено — тогда сразу дальше
+        self.active_quest = None
+        while self.queue:
             self.active_quest = self.queue.pop(0)
+            if not self.active_quest["condition"]():
+                return
+            self.completed.append(self.active_quest["id"])
+            self.active_quest = None
+
+    # ---------- уведомления ----------
+
+    def _depends_on(self, key):
+        deps = self.active_quest["deps"]
+        return deps is None or key in deps
+
+    def on_resources_changed(self, rids):
+        if not self.active_quest or not rids:
+            return
+        if any(self._depends_on(("resource", rid)) for rid in rids):
+            self.update()
+
+    def on_buildings_changed(self, btype):
+        if not self.active_quest:
+            return
+        if btype is None or self._depends_on(("building", btype)):
+            self.update()
 
     def update(self):
+        """Проверить активное задание прямо сейчас."""
         if self.active_quest and self.active_quest["condition"]():
             self.completed.append(self.active_quest["id"])
-            if self.queue:
-                self.active_quest = self.queue.pop(0)
-            else:
-                self.active_quest = None
+            self._next()
 
     def draw(self, screen):
         if not self.active_quest:
             return
-        txt = self.font.render(f"Задание: {self.active_quest['text']}", True, (255, 230, 120))
+        txt = render_text(self.font, f"Задание: {self.active_quest['text']}", (255, 230, 120))
         screen.blit(txt, (20, 20))
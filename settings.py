@@ -1,6 +1,31 @@
 WINDOW_WIDTH = 1536
 WINDOW_HEIGHT = 1024
 FPS = 60
+# выводить на экран только изменившиеся прямоугольники вместо flip()
+DIRTY_RECTS = True
+
+# автосохранение в фоне, мс; сколько резервных копий save.json держать
+AUTOSAVE_INTERVAL = 60000
+SAVE_BACKUPS = 3
+# после стольких записей журнала автосохранение делает полный снимок
+JOURNAL_COMPACT_EVERY = 200
+# начислять ресурсы за время, пока игра была закрыта; не больше чем за столько мс
+OFFLINE_PROGRESS = True
+OFFLINE_PROGRESS_MAX_MS = 24 * 60 * 60 * 1000
+
+# сколько «+N» после кликов живёт одновременно; лишние вытесняют старые
+PARTICLE_CAP = 256
+
+# размер мира в клетках (на экране — окно камеры) и скорость прокрутки, px/мс
+WORLD_COLS = 256
+WORLD_ROWS = 256
+CAMERA_PAN_SPEED = 0.8
+# уровни зума (доля от размера клетки) и потолок кэша уменьшенных картинок, МБ
+ZOOM_LEVELS = (1.0, 0.75, 0.5, 0.25, 0.125)
+SPRITE_CACHE_MB = 32
+
+# профайлер кадра: F3 — панель, F4 — последние секунды в Chrome trace (chrome://tracing)
+PROFILER_TRACE_PATH = "profile_trace.json"
 
 # Sizes
 ICON_SIZE = 32
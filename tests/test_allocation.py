@@ -0,0 +1,38 @@
+# tests/test_allocation.py
+import os
+
+import pytest
+
+from core.resource_manager import ResourceManager
+from core.simulation import load_balance
+from worlds.building_manager import BuildingManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_default_config_shares_shortage_by_priority():
+    """
+    Энергии меньше, чем просят. Завод (priority 0) построен первым, но
+    теплица и водокачка (priority 1) получают её раньше — поровну в долях.
+    """
+    balance = load_balance(os.path.join(ROOT, "balance.json"))
+    buildings = BuildingManager(balance, 128)
+    assert buildings.tables.allocation == "priority"
+    resources = ResourceManager(balance, tables=buildings.tables)
+
+    buildings.load_from_save_data([
+        {"type": "factory", "grid_x": 0, "grid_y": 0, "level": 1},
+        {"type": "greenhouse", "grid_x": 1, "grid_y": 0, "level": 1},
+        {"type": "water_extractor", "grid_x": 2, "grid_y": 0, "level": 1},
+    ])
+    # теплица 0.009 + водокачка 0.008 — хватает на половину
+    resources.set("energy", 0.0085)
+    food, water, materials = (resources.get(r) for r in ("food", "water", "materials"))
+
+    buildings.produce_all(resources)
+
+    assert resources.get("energy") == pytest.approx(0.0, abs=1e-6)
+    assert resources.get("food") - food == pytest.approx(0.005, abs=1e-6)
+    assert resources.get("water") - water == pytest.approx(0.0125, abs=1e-6)
+    # заводу не досталось ничего
+    assert resources.get("materials") == materials
@@ -0,0 +1,48 @@
+# tests/test_dirty_draw.py
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core.save_manager import SaveManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+W, H = 1536, 1024
+
+
+def _game(tmp_path, monkeypatch):
+    # игра грузит assets/ и balance.json относительными путями
+    monkeypatch.chdir(ROOT)
+    from game import Game
+
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    game = Game(screen, W, H, dirty_rects=True)
+    # сохранения — во временную папку, save.json игрока не трогаем
+    game.save_manager = SaveManager(str(tmp_path / "save.json"), backups=0)
+    game.engine.journal = game.save_manager.append
+    game.reset_game()
+    return game
+
+
+def test_dirty_frames_match_full_redraw_with_upgrade_window(tmp_path, monkeypatch):
+    """Частицы поверх рамки окна апгрейда: кадр по кусочкам == кадр целиком."""
+    game = _game(tmp_path, monkeypatch)
+    game.buildings.load_from_save_data([{"type": next(iter(game.balance["buildings"])), "grid_x": 2, "grid_y": 2, "level": 1}])
+    game.upgrade_target = game.buildings.buildings[0]
+    game.upgrade_window_open = True
+
+    x, y, w, h = game.upgrade_rect
+    rnd = random.Random(3)
+    for _ in range(60):
+        # у левой и верхней рамки окна
+        game.click_particles.spawn(x + rnd.randint(-30, 30), y + rnd.randint(0, h), "+1")
+        game.click_particles.spawn(x + rnd.randint(0, w), y + rnd.randint(-30, 30), "+1")
+        game.update(16)
+        game.draw()
+        dirty = pygame.image.tobytes(game.screen, "RGB")
+        game._draw_scene()
+        assert pygame.image.tobytes(game.screen, "RGB") == dirty
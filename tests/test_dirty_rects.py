@@ -0,0 +1,52 @@
+# tests/test_dirty_rects.py
+import random
+import time
+
+import pygame
+
+from ui.dirty_rects import DirtyRects
+
+W, H = 1536, 1024
+
+
+def _scattered(n, seed=1):
+    rnd = random.Random(seed)
+    return [pygame.Rect(rnd.randrange(W - 40), rnd.randrange(H - 40), rnd.randint(10, 80), rnd.randint(10, 60))
+            for _ in range(n)]
+
+
+def _particle_pairs(n, seed=2):
+    """Где частица была и где стала — как в Game._collect_dirty_rects."""
+    rnd = random.Random(seed)
+    rects = []
+    for _ in range(n):
+        x, y = rnd.randrange(W - 40), rnd.randrange(H - 40)
+        rects += [pygame.Rect(x, y, 40, 20), pygame.Rect(x, y - 3, 40, 20)]
+    return rects
+
+
+def test_merge_covers_every_rect():
+    dirty = DirtyRects(W, H)
+    for rects in (_scattered(40), _particle_pairs(20)):
+        groups = dirty.merge(rects)
+        assert len(groups) <= DirtyRects.MAX_GROUPS
+        assert all(any(g.contains(r) for g in groups) for r in rects)
+
+
+def test_merge_many_rects_is_fast():
+    dirty = DirtyRects(W, H)
+    for rects in (_scattered(512), _particle_pairs(256), _scattered(2048)):
+        t0 = time.perf_counter()
+        groups = dirty.merge(rects)
+        assert time.perf_counter() - t0 < 0.1
+        assert all(any(g.contains(r) for g in groups) for r in rects)
+
+
+def test_pop_falls_back_to_full_frame_on_rect_burst():
+    dirty = DirtyRects(W, H)
+    dirty.pop()  # первый кадр всегда целиком
+    for r in _particle_pairs(256):
+        dirty.add(r)
+    t0 = time.perf_counter()
+    assert dirty.pop() is None
+    assert time.perf_counter() - t0 < 0.05
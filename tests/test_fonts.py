@@ -0,0 +1,27 @@
+# tests/test_fonts.py
+import os
+
+import pygame
+
+from ui import fonts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pixels(font, text="Ресурсы: 42"):
+    return pygame.image.tobytes(font.render(text, True, (255, 255, 255)), "RGBA")
+
+
+def test_without_font_files_text_looks_like_system_font(monkeypatch):
+    """Нет assets/fonts — обычный текст как у SysFont до реестра, не жирный."""
+    pygame.font.init()
+    monkeypatch.setattr(fonts, "FONTS_FOLDER", os.path.join(ROOT, "no_such_fonts"))
+    fonts.clear_fonts()
+    try:
+        regular = fonts.get_font("ui", 20)
+        bold = fonts.get_font("ui", 24, bold=True)
+        assert regular is fonts.get_font("ui", 20)
+        assert _pixels(regular) == _pixels(pygame.font.SysFont(fonts.SYSTEM_FONT, 20))
+        assert _pixels(bold) == _pixels(pygame.font.SysFont(fonts.SYSTEM_FONT, 24, bold=True))
+    finally:
+        fonts.clear_fonts()
@@ -0,0 +1,76 @@
+# tests/test_save_manager.py
+import threading
+
+from core.save_manager import SaveManager
+
+
+def test_checkpoint_survives_concurrent_trim(tmp_path):
+    """
+    Фоновая запись снимка (_write -> _trim_journal) закрывает файл журнала.
+    checkpoint() на игровом потоке не должен падать, а load() — терять записи.
+    """
+    sm = SaveManager(str(tmp_path / "save.json"), backups=0)
+    sm.save({"resources": {}, "buildings": [], "state": {}})
+
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            while not stop.is_set():
+                # снимок старше всех записей журнала: обрезка их не трогает
+                sm._write({"resources": {}, "buildings": [], "state": {}, "journal_seq": 0})
+                sm._trim_journal(0)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for i in range(300):
+            sm.append({"op": "place", "type": "solar_panel", "grid_x": i, "grid_y": 0})
+            sm.checkpoint({"materials": i}, {"step": i})
+    finally:
+        stop.set()
+        thread.join()
+
+    assert not errors
+    data = SaveManager(str(tmp_path / "save.json"), backups=0).load()
+    assert [b["grid_x"] for b in data["buildings"]] == list(range(300))
+    assert data["resources"] == {"materials": 299}
+
+
+class _GatedSaveManager(SaveManager):
+    """Фоновая запись забирает снимок и ждёт gate — до того, как возьмёт _write_lock."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.taken = threading.Event()
+        self.gate = threading.Event()
+
+    def _write(self, data):
+        if threading.current_thread() is self._thread:
+            self.taken.set()
+            self.gate.wait(5)
+        super()._write(data)
+
+
+def test_sync_save_is_not_overwritten_by_older_async_snapshot(tmp_path):
+    sm = _GatedSaveManager(str(tmp_path / "save.json"), backups=0)
+    sm.save_async({"resources": {"materials": 1}, "buildings": [], "state": {}})
+    assert sm.taken.wait(5)
+
+    sm.append({"op": "place", "type": "solar_panel", "grid_x": 3, "grid_y": 4})
+    saver = threading.Thread(target=sm.save, args=({
+        "resources": {"materials": 2},
+        "buildings": [{"type": "solar_panel", "grid_x": 3, "grid_y": 4, "level": 1}],
+        "state": {},
+    },))
+    saver.start()
+    saver.join(0.2)
+    sm.gate.set()
+    saver.join()
+    sm.wait()
+
+    data = SaveManager(str(tmp_path / "save.json"), backups=0).load()
+    assert data["resources"] == {"materials": 2}
+    assert len(data["buildings"]) == 1
@@ -0,0 +1,52 @@
+# tests/test_shop.py
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core.resource_manager import ResourceManager
+from core.simulation import load_balance
+from core.timers import Scheduler
+from toast import ToastManager
+from ui.shop import FLASH_MS, Shop
+from worlds.building_manager import BuildingManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _State:
+    selected_building_type = None
+
+
+def test_flash_clears_on_empty_shared_scheduler():
+    """Общий Scheduler без таймеров пуст (len 0), но Shop должен взять именно его."""
+    pygame.init()
+    balance = load_balance(os.path.join(ROOT, "balance.json"))
+    timers = Scheduler()
+    resources = ResourceManager(balance)
+    for rid in resources.values:
+        resources.set(rid, 1e9)
+    shop = Shop(
+        balance=balance,
+        building_manager=BuildingManager(balance, 128),
+        resource_manager=resources,
+        panel_width=300,
+        screen_width=1536,
+        btn_image=pygame.Surface((260, 80)),
+        timers=timers
+    )
+    assert shop.timers is timers
+
+    toast = ToastManager(pygame.font.Font(None, 20), timers)
+    for btype in shop.items:
+        shop._buy_building(btype, _State(), toast)
+        if shop.shop_flash_time > 0:
+            break
+    assert shop.shop_flash_time == FLASH_MS
+
+    timers.advance(FLASH_MS)
+    assert shop.shop_flash_time == 0
+    # вспышка кончилась — панель перерисуется ещё раз и дальше успокоится
+    assert shop.dirty_rect(1024) is not None
+    assert shop.dirty_rect(1024) is None
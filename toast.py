@@ -1,23 +1,50 @@
 import pygame
+
+from ui.text_cache import render_text
+
+
 class ToastManager:
-    def __init__(self, font):
+    """Сообщения внизу экрана; каждое снимается своим таймером (core.timers)."""
+    def __init__(self, font, timers):
         self.font = font
+        self.timers = timers
         self.toasts = []
 
+        # для dirty-rect режима: менялся ли список с прошлого кадра
+        self.changed = False
+        self._drawn_count = 0
+
     def show(self, text, duration=2000):
-        self.toasts.append({
-            "text": text,
-            "time": duration
-        })
+        toast = {"text": text}
+        self.toasts.append(toast)
+        self.timers.after(duration, lambda: self._expire(toast))
+        self.changed = True
 
-    def update(self, dt):
-        for t in self.toasts:
-            t["time"] -= dt
-        self.toasts = [t for t in self.toasts if t["time"] > 0]
+    def clear(self):
+        if self.toasts:
+            self.toasts = []
+            self.changed = True
+
+    def _expire(self, toast):
+        if toast in self.toasts:
+            self.toasts.remove(toast)
+            self.changed = True
+
+    def dirty_rect(self, width, height):
+        """Полоса тостов, если список поменялся (иначе None)."""
+        if not self.changed:
+            return None
+        self.changed = False
+        n = max(len(self.toasts), self._drawn_count)
+        self._drawn_count = len(self.toasts)
+        if n == 0:
+            return None
+        top = height - 80 - 40 * (n - 1)
+        return (0, top, width, 40 * n)
 
     def draw(self, screen, width, height):
         y = height - 80
         for t in self.toasts:
-            surf = self.font.render(t["text"], True, (255, 230, 150))
+            surf = render_text(self.font, t["text"], (255, 230, 150))
             screen.blit(surf, (width//2 - surf.get_width()//2, y))
             y -= 40
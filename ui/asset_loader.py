@@ -0,0 +1,91 @@
+# ui/asset_loader.py
+import threading
+import time
+
+import pygame
+
+
+class AssetLoader:
+    """
+    Фоновая загрузка картинок, которые нужны только игре (не меню).
+
+    Рабочий поток только декодирует PNG и масштабирует их. convert()/
+    convert_alpha() делает главный поток в take() — формат дисплея
+    трогаем только оттуда. take() ждёт лишь ту картинку, которую просят,
+    если поток до неё ещё не дошёл.
+    """
+    def __init__(self):
+        self._jobs = []
+        self._results = {}
+        self._ready = {}
+        self._thread = None
+
+        self.total = 0
+        self.done = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @staticmethod
+    def _key(path, size):
+        return (path, tuple(size) if size else None)
+
+    def start(self, items):
+        """items: [(path, size или None)]"""
+        for path, size in items:
+            key = self._key(path, size)
+            if key in self._ready:
+                continue
+            self._ready[key] = threading.Event()
+            self._jobs.append(key)
+        self.total = len(self._jobs)
+        self.started_at = time.perf_counter()
+
+        self._thread = threading.Thread(target=self._work, name="asset-loader", daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        for key in self._jobs:
+            path, size = key
+            try:
+                img = pygame.image.load(path)
+                if size:
+                    img = pygame.transform.scale(img, size)
+                self._results[key] = img
+            except Exception as e:
+                self._results[key] = e
+            self.done += 1
+            self._ready[key].set()
+        self.finished_at = time.perf_counter()
+
+    def progress(self):
+        if not self.total:
+            return 1.0
+        return self.done / self.total
+
+    def is_done(self):
+        return self.done >= self.total
+
+    def take(self, path, size=None, alpha=True):
+        """
+        Готовая картинка или None, если её не заказывали (или загрузка
+        упала — тогда вызывающий грузит сам и увидит ошибку как раньше).
+        """
+        key = self._key(path, size)
+        event = self._ready.get(key)
+        if event is None:
+            return None
+        event.wait()
+        img = self._results.pop(key, None)
+        del self._ready[key]
+        if img is None or isinstance(img, Exception):
+            return None
+        return img.convert_alpha() if alpha else img.convert()
+
+    def elapsed_ms(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000.0
+
+
+# общий загрузчик игровых картинок
+game_assets = AssetLoader()
@@ -0,0 +1,270 @@
+# ui/atlas.py
+"""
+Запечённый атлас картинок.
+
+Офлайн (один раз на размер окна):
+
+    python -m ui.atlas --width 1536 --height 1024
+
+читает balance.json, масштабирует фоны, иконки и спрайты зданий до
+итоговых размеров и пишет их сырыми пикселями в один файл assets/atlas.bin.
+В игре файл читается одним read, каждая страница один раз конвертируется
+в формат дисплея, а картинки отдаются как subsurface.
+
+Если атласа нет, он битый или исходный PNG новее запечённого —
+load_image() просто грузит файл по-старому.
+"""
+import argparse
+import json
+import os
+import struct
+
+import pygame
+
+from settings import BUILDING_SIZE, ICON_SIZE
+from ui.asset_loader import game_assets
+
+
+ATLAS_PATH = os.path.join("assets", "atlas.bin")
+MAGIC = b"MCATLAS1"
+VERSION = 1
+
+# ширина страницы с прозрачными картинками
+ALPHA_PAGE_WIDTH = 1024
+
+_atlas = None
+
+
+def _key(path, size):
+    path = os.path.normpath(path).replace(os.sep, "/")
+    if size is None:
+        return path
+    return f"{path}@{size[0]}x{size[1]}"
+
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetAtlas:
+    def __init__(self, header, pages):
+        self.header = header
+        self.pages = pages  # список Surface в формате дисплея
+        self.entries = header["entries"]
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path=ATLAS_PATH):
+        """Возвращает AssetAtlas или None, если файла нет или он битый."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = memoryview(f.read())
+
+            if bytes(data[:len(MAGIC)]) != MAGIC:
+                raise ValueError("не атлас")
+            pos = len(MAGIC)
+            (header_len,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            header = json.loads(bytes(data[pos:pos + header_len]).decode("utf-8"))
+            if header.get("version") != VERSION:
+                raise ValueError("другая версия атласа")
+            base = pos + header_len
+
+            pages = []
+            for page in header["pages"]:
+                start = base + page["offset"]
+                pixels = data[start:start + page["length"]]
+                surf = pygame.image.frombuffer(pixels, tuple(page["size"]), page["mode"])
+                # копия в формате дисплея — буфер файла дальше не нужен
+                if page["mode"] == "RGBA":
+                    surf = surf.convert_alpha()
+                else:
+                    surf = surf.convert()
+                pages.append(surf)
+            return cls(header, pages)
+        except Exception as e:
+            print("Атлас не загружен, грузим картинки по одной:", e)
+            return None
+
+    def has(self, path, size=None):
+        """Есть ли свежая запись для картинки."""
+        entry = self.entries.get(_key(path, size))
+        if entry is None:
+            return False
+        try:
+            return list(_source_stamp(path)) == [entry["mtime_ns"], entry["bytes"]]
+        except OSError:
+            return True  # исходника нет (например, в сборке) — запечённая копия годится
+
+    def get(self, path, size=None):
+        """Subsurface из атласа или None, если записи нет или она устарела."""
+        if not self.has(path, size):
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = self.entries[_key(path, size)]
+        return self.pages[entry["page"]].subsurface(pygame.Rect(entry["rect"]))
+
+
+def open_atlas(path=ATLAS_PATH):
+    """Вызывается после pygame.display.set_mode."""
+    global _atlas
+    _atlas = AssetAtlas.load(path)
+    return _atlas
+
+
+def get_atlas():
+    return _atlas
+
+
+def load_image(path, size=None, alpha=True):
+    """
+    Картинка нужного размера: из атласа, из фоновой загрузки
+    (ui.asset_loader), а если нигде нет — с диска (load + convert + scale).
+    """
+    if _atlas is not None:
+        surf = _atlas.get(path, size)
+        if surf is not None:
+            return surf
+
+    surf = game_assets.take(path, size, alpha)
+    if surf is not None:
+        return surf
+
+    img = pygame.image.load(path)
+    img = img.convert_alpha() if alpha else img.convert()
+    if size is not None:
+        img = pygame.transform.scale(img, size)
+    return img
+
+
+# ------------------------------------------------------------
+# ЗАПЕКАНИЕ
+# ------------------------------------------------------------
+
+def game_images(balance, width, height):
+    """
+    Картинки, которые нужны только игре (не меню): [(path, size или None, alpha)].
+    Один список на всех: по нему грузит фон (ui.asset_loader, пока открыто
+    меню) и запекает атлас (collect_assets).
+    """
+    items = [
+        (os.path.join("assets", "backgrounds", "background_mars.png"), (width, height), False),
+        # тот же путь, что в Game: фоновый загрузчик ищет картинку по строке
+        ("assets/ui/btn_new_game.png", None, True),
+        (os.path.join("assets", "ui", "exit_button.png"), None, True),
+        (os.path.join("assets", "ui", "btn_shop.png"), None, True),
+    ]
+    for res in balance.get("resources", []):
+        if res.get("icon"):
+            items.append((os.path.join("assets", "icons", res["icon"]), (ICON_SIZE, ICON_SIZE), True))
+    for cfg in balance.get("buildings", {}).values():
+        if cfg.get("sprite"):
+            items.append((os.path.join("assets", "buildings", cfg["sprite"]), (BUILDING_SIZE, BUILDING_SIZE), True))
+    return items
+
+
+def collect_assets(balance, width, height):
+    """
+    Что запекать: (path, size, alpha) — картинки игры с известным размером
+    (game_images) и фон меню.
+    """
+    items = [(os.path.join("assets", "backgrounds", "menu_bg.png"), (width, height), False)]
+    items += [item for item in game_images(balance, width, height) if item[1] is not None]
+    return items
+
+
+def _pack_shelves(sizes, page_width):
+    """Простая полочная упаковка: возвращает позиции и высоту страницы."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > page_width:
+            x = 0
+            y += shelf_h
+            shelf_h = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return positions, y + shelf_h
+
+
+def _page_bytes(images, positions, page_w, page_h, bpp):
+    buf = bytearray(page_w * page_h * bpp)
+    for (w, h, pixels), (x, y) in zip(images, positions):
+        row = w * bpp
+        for r in range(h):
+            dst = ((y + r) * page_w + x) * bpp
+            buf[dst:dst + row] = pixels[r * row:(r + 1) * row]
+    return bytes(buf)
+
+
+def bake_atlas(balance, width, height, out_path=ATLAS_PATH):
+    groups = {"RGB": [], "RGBA": []}
+    for path, size, alpha in collect_assets(balance, width, height):
+        if not os.path.exists(path):
+            print("Пропуск (нет файла):", path)
+            continue
+        mode = "RGBA" if alpha else "RGB"
+        img = pygame.transform.scale(pygame.image.load(path), size)
+        pixels = pygame.image.tobytes(img, mode)
+        groups[mode].append((path, size, pixels))
+
+    header = {"version": VERSION, "window": [width, height], "pages": [], "entries": {}}
+    blobs = []
+    offset = 0
+    for mode, items in groups.items():
+        if not items:
+            continue
+        bpp = len(mode)
+        sizes = [size for _, size, _ in items]
+        page_w = max(ALPHA_PAGE_WIDTH if mode == "RGBA" else 0, max(w for w, _ in sizes))
+        positions, page_h = _pack_shelves(sizes, page_w)
+        blob = _page_bytes([(w, h, px) for _, (w, h), px in items], positions, page_w, page_h, bpp)
+
+        page_index = len(header["pages"])
+        header["pages"].append({"mode": mode, "size": [page_w, page_h], "offset": offset, "length": len(blob)})
+        for (path, size, _), (x, y) in zip(items, positions):
+            mtime_ns, nbytes = _source_stamp(path)
+            header["entries"][_key(path, size)] = {
+                "page": page_index,
+                "rect": [x, y, size[0], size[1]],
+                "mtime_ns": mtime_ns,
+                "bytes": nbytes,
+            }
+        blobs.append(blob)
+        offset += len(blob)
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+    return header
+
+
+def main():
+    from core.simulation import load_balance
+
+    parser = argparse.ArgumentParser(description="Запечь картинки в атлас")
+    parser.add_argument("--width", type=int, default=1536)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--out", default=ATLAS_PATH)
+    args = parser.parse_args()
+
+    header = bake_atlas(load_balance("balance.json"), args.width, args.height, args.out)
+    print(f"Атлас {args.out}: {len(header['entries'])} картинок, {len(header['pages'])} стр.")
+
+
+if __name__ == "__main__":
+    main()
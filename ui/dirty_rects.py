@@ -0,0 +1,96 @@
+# ui/dirty_rects.py
+import pygame
+
+
+class DirtyRects:
+    """
+    Список изменившихся за кадр прямоугольников экрана.
+
+    Подсистемы сообщают, что они поменяли (add), крупные перемены сцены
+    требуют полной перерисовки (invalidate). pop() отдаёт либо список
+    прямоугольников для pygame.display.update(rects), либо None — тогда
+    кадр рисуется и выводится целиком.
+    """
+    # если изменилась бо́льшая часть экрана, проще перерисовать всё
+    FULL_AREA_RATIO = 0.6
+    # прямоугольники сливаются, если общая рамка не больше суммы площадей
+    # плюс столько (пиксели²) — мелкие соседи рисуются одним проходом
+    MERGE_SLACK = 64 * 64
+    # с группами дальше этого по x не сравниваем (см. merge)
+    MERGE_REACH = 64
+    # больше проходов сцены за кадр не делаем — остаток сливаем в рамку
+    MAX_GROUPS = 8
+    # столько прямоугольников за кадр (вспышка частиц) — дешевле вывести всё
+    MAX_RECTS = 128
+
+    def __init__(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.rects = []
+        self.full = True
+
+    def add(self, rect):
+        if not rect:
+            return
+        r = pygame.Rect(rect).clip(self.screen_rect)
+        if r.width and r.height:
+            self.rects.append(r)
+
+    def invalidate(self):
+        self.full = True
+
+    def pop(self):
+        rects = self.rects
+        self.rects = []
+        if self.full:
+            self.full = False
+            return None
+
+        if len(rects) > self.MAX_RECTS:
+            return None
+        area = sum(r.width * r.height for r in rects)
+        if area > self.screen_rect.width * self.screen_rect.height * self.FULL_AREA_RATIO:
+            return None
+        return self.merge(rects)
+
+    def merge(self, rects):
+        """
+        Группы для отдельных проходов отрисовки: пересекающиеся и близкие
+        прямоугольники — в одну рамку, далёкие (HUD сверху и магазин справа)
+        остаются раздельными, чтобы не перерисовывать всё между ними.
+
+        Один проход слева направо: прямоугольник сравнивается только с
+        группами, до которых дотягивается по x (MERGE_REACH), — частицы
+        по всему экрану не превращают кадр в перебор всех пар.
+        """
+        done = []
+        active = []
+        for r in sorted(rects, key=lambda r: r.left):
+            reach = r.left - self.MERGE_REACH
+            still = []
+            for g in active:
+                (still if g.right >= reach else done).append(g)
+            active = still
+
+            group = pygame.Rect(r)
+            # рамка растёт по ходу и может зацепить следующие группы
+            keep = []
+            for g in active:
+                if self._fits(g, group):
+                    group = group.union(g)
+                else:
+                    keep.append(g)
+            keep.append(group)
+            active = keep
+        groups = done + active
+
+        if len(groups) > self.MAX_GROUPS:
+            # самые мелкие — в одну рамку
+            groups.sort(key=lambda r: r.width * r.height, reverse=True)
+            rest = groups[self.MAX_GROUPS - 1:]
+            groups = groups[:self.MAX_GROUPS - 1] + [rest[0].unionall(rest[1:])]
+        return groups
+
+    def _fits(self, a, b):
+        """Слить a и b: общая рамка не больше их площадей плюс MERGE_SLACK."""
+        u = a.union(b)
+        return u.width * u.height <= a.width * a.height + b.width * b.height + self.MERGE_SLACK
@@ -0,0 +1,60 @@
+# ui/fonts.py
+import os
+
+import pygame
+
+
+FONTS_FOLDER = os.path.join("assets", "fonts")
+# своих файлов нет — системный шрифт, как было до реестра
+SYSTEM_FONT = "arial"
+
+# общий на весь процесс кэш: (name, size, bold) -> Font
+_fonts = {}
+
+
+def _font_path(name, bold):
+    """
+    assets/fonts/<name>-bold.ttf для жирного (если есть), иначе <name>.ttf.
+    None — своего файла нет, берём SYSTEM_FONT.
+    """
+    candidates = [f"{name}-bold.ttf", f"{name}.ttf"] if bold else [f"{name}.ttf"]
+    for filename in candidates:
+        path = os.path.join(FONTS_FOLDER, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def get_font(name="ui", size=20, bold=False):
+    """
+    Шрифт из assets/fonts, если файл есть, иначе системный SYSTEM_FONT.
+    Один и тот же (name, size, bold) отдаётся одним объектом Font: SysFont
+    зовётся один раз на ключ, список системных шрифтов pygame собирает
+    один раз на процесс.
+    """
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    path = _font_path(name, bold)
+    font = None
+    if path is not None:
+        try:
+            font = pygame.font.Font(path, size)
+        except Exception as e:
+            print("Ошибка загрузки шрифта:", path, e)
+
+    if font is None:
+        # жирность SysFont ставит сам — по файлу жирного начертания или синтетически
+        font = pygame.font.SysFont(SYSTEM_FONT, size, bold=bold)
+    elif bold and not path.endswith("-bold.ttf"):
+        # отдельного жирного файла нет — жирность синтетическая
+        font.set_bold(True)
+
+    _fonts[key] = font
+    return font
+
+
+def clear_fonts():
+    _fonts.clear()
@@ -1,6 +1,8 @@
 import pygame
 import os
 
+from ui.atlas import load_image
+
 
 class ImageButton:
     def __init__(self, image_path, hover_path, x, y):
@@ -35,7 +37,7 @@ class MainMenu:
 
         # фон
         bg_path = "assets/backgrounds/menu_bg.png"
-        self.background = pygame.image.load(bg_path).convert() if os.path.exists(bg_path) else None
+        self.background = load_image(bg_path, (width, height), alpha=False) if os.path.exists(bg_path) else None
 
         # звук клика
         click_path = "assets/sounds/btn_sound.mp3"
@@ -68,11 +70,10 @@ class MainMenu:
         self.continue_btn.update(mouse_pos)
         self.restart_btn.update(mouse_pos)
 
-    def draw(self, has_save: bool):
+    def draw(self, has_save: bool, load_progress=1.0):
         # фон
         if self.background:
-            bg = pygame.transform.scale(self.background, (self.width, self.height))
-            self.screen.blit(bg, (0, 0))
+            self.screen.blit(self.background, (0, 0))
         else:
             self.screen.fill((20, 20, 30))
 
@@ -83,6 +84,10 @@ class MainMenu:
         else:
             self.start_btn.draw(self.screen)
 
+        # фоновая загрузка игры ещё идёт
+        if load_progress < 1.0:
+            self._draw_load_progress(load_progress)
+
         # плавное появление
         if self.fade_alpha > 0:
             fade = pygame.Surface((self.width, self.height))
@@ -91,6 +96,13 @@ class MainMenu:
             self.screen.blit(fade, (0, 0))
             self.fade_alpha -= 5
 
+    def _draw_load_progress(self, progress):
+        bar = pygame.Rect(self.width // 2 - 150, self.height - 60, 300, 8)
+        pygame.draw.rect(self.screen, (60, 60, 80), bar, border_radius=4)
+        fill = bar.copy()
+        fill.width = int(bar.width * progress)
+        pygame.draw.rect(self.screen, (255, 200, 120), fill, border_radius=4)
+
     def handle_event(self, event):
         has_save = os.path.exists("save.json")
 
@@ -0,0 +1,89 @@
+# ui/particles.py
+from array import array
+
+import pygame
+
+
+class ParticlePool:
+    """
+    Всплывающие «+N» после клика — кольцевой буфер фиксированной ёмкости.
+
+    Позиция, момент появления и номер текста лежат в параллельных массивах.
+    Время жизни у всех одинаковое, поэтому старейшая частица всегда в голове
+    буфера: истёкшие снимаются с головы, а при переполнении новая
+    вытесняет самую старую. Картинка текста рендерится один раз на текст.
+    """
+    def __init__(self, font, timers, capacity=256, life_ms=600, rise=0.05):
+        self.font = font
+        self.timers = timers
+        self.capacity = capacity
+        self.life_ms = life_ms
+        self.rise = rise  # px/мс вверх
+
+        self.x = array("d", [0.0] * capacity)
+        self.y0 = array("d", [0.0] * capacity)
+        self.born = array("d", [0.0] * capacity)
+        self.text_id = array("i", [0] * capacity)
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+
+        # текст -> номер, и готовые картинки по номерам
+        self._text_index = {}
+        self._glyphs = []
+
+    def _glyph_id(self, text):
+        tid = self._text_index.get(text)
+        if tid is None:
+            tid = len(self._glyphs)
+            self._text_index[text] = tid
+            # своя копия: альфу меняем прямо на ней
+            self._glyphs.append(self.font.render(text, True, (255, 255, 255)).convert_alpha())
+        return tid
+
+    def spawn(self, x, y, text):
+        if self.count == self.capacity:
+            # нет места — вытесняем самую старую
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.dropped += 1
+        i = (self.head + self.count) % self.capacity
+        self.x[i] = x
+        self.y0[i] = y
+        self.born[i] = self.timers.now
+        self.text_id[i] = self._glyph_id(text)
+        self.count += 1
+
+    def update(self):
+        """Снять истёкшие — только их, с головы буфера."""
+        deadline = self.timers.now - self.life_ms
+        while self.count and self.born[self.head] <= deadline:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _live(self):
+        now = self.timers.now
+        for k in range(self.count):
+            i = (self.head + k) % self.capacity
+            age = now - self.born[i]
+            yield i, self.x[i], self.y0[i] - self.rise * age, age
+
+    def rects(self):
+        """Где частицы сейчас — для dirty-rect режима."""
+        return [
+            pygame.Rect((int(x), int(y)), self._glyphs[self.text_id[i]].get_size())
+            for i, x, y, _ in self._live()
+        ]
+
+    def draw(self, screen):
+        for i, x, y, age in self._live():
+            glyph = self._glyphs[self.text_id[i]]
+            glyph.set_alpha(max(0, min(255, int((self.life_ms - age) / self.life_ms * 255))))
+            screen.blit(glyph, (x, y))
@@ -0,0 +1,96 @@
+# ui/profiler_overlay.py
+import pygame
+
+
+class ProfilerOverlay:
+    """
+    Панель профайлера (core.profiler): p50/p99 кадра, мс по областям
+    и график времени кадров.
+
+    Текст меняется каждый кадр, поэтому панель пересобирается не чаще
+    refresh_ms и рисуется одним blit. Фон непрозрачный: в dirty-rect
+    режиме повторный вывод поверх себя даёт ту же картинку.
+    """
+    BUDGET_MS = 1000 / 60
+    GRAPH_H = 60
+
+    def __init__(self, profiler, font, pos=(10, 60), width=380, refresh_ms=250):
+        self.profiler = profiler
+        self.font = font
+        self.pos = pos
+        self.width = width
+        self.refresh_ms = refresh_ms
+
+        self.visible = False
+        self._surface = None
+        self._built_at = None
+        # панель только растёт: иначе в dirty-rect режиме под убывшей частью
+        # остался бы старый кадр
+        self._height = 0
+
+    def toggle(self):
+        """Показ панели включает запись, скрытие — выключает."""
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible)
+        self._surface = None
+        self._height = 0
+
+    @property
+    def rect(self):
+        if self._surface is None:
+            return pygame.Rect(self.pos, (0, 0))
+        return self._surface.get_rect(topleft=self.pos)
+
+    def draw(self, screen):
+        """Возвращает прямоугольник панели (для display.update) или None."""
+        if not self.visible:
+            return None
+        now = pygame.time.get_ticks()
+        if self._surface is None or now - self._built_at >= self.refresh_ms:
+            self._surface = self._build()
+            self._built_at = now
+        screen.blit(self._surface, self.pos)
+        return self.rect
+
+    def _build(self):
+        p50, p99 = self.profiler.percentiles(0.5, 0.99)
+        lines = [(f"кадр: p50 {p50:.2f} мс  p99 {p99:.2f} мс  ({len(self.profiler.frames)} кадров)",
+                  (255, 230, 120))]
+        for name, depth, ms in self.profiler.scope_stats():
+            lines.append((f"{'  ' * depth}{name}", f"{ms:.2f} мс"))
+        lines.append(("F3 — скрыть, F4 — Chrome trace", (150, 150, 150)))
+
+        line_h = self.font.get_linesize()
+        pad = 8
+        self._height = max(self._height, pad * 3 + line_h * len(lines) + self.GRAPH_H)
+        height = self._height
+        surf = pygame.Surface((self.width, height))
+        surf.fill((20, 20, 28))
+        pygame.draw.rect(surf, (90, 90, 110), surf.get_rect(), 1)
+
+        y = pad
+        for left, right in lines:
+            if isinstance(right, tuple):
+                surf.blit(self.font.render(left, True, right), (pad, y))
+            else:
+                surf.blit(self.font.render(left, True, (220, 220, 220)), (pad, y))
+                value = self.font.render(right, True, (220, 220, 220))
+                surf.blit(value, (self.width - pad - value.get_width(), y))
+            y += line_h
+
+        self._draw_graph(surf, pygame.Rect(pad, height - pad - self.GRAPH_H, self.width - 2 * pad, self.GRAPH_H))
+        return surf
+
+    def _draw_graph(self, surf, area):
+        """Последние кадры столбиками справа налево; линия — бюджет 60 FPS."""
+        pygame.draw.rect(surf, (32, 32, 44), area)
+        times = self.profiler.frame_times()[-area.width:]
+        top = max(2 * self.BUDGET_MS, max(times, default=0.0))
+        x = area.right - len(times)
+        for ms in times:
+            h = max(1, int(min(ms, top) / top * area.height))
+            color = (90, 200, 120) if ms <= self.BUDGET_MS else (230, 90, 80)
+            pygame.draw.line(surf, color, (x, area.bottom - 1), (x, area.bottom - h))
+            x += 1
+        budget_y = area.bottom - int(self.BUDGET_MS / top * area.height)
+        pygame.draw.line(surf, (200, 200, 200), (area.left, budget_y), (area.right - 1, budget_y))
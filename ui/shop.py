@@ -1,12 +1,20 @@
 # ui/shop.py
 import pygame
 
+from core.timers import Scheduler
+from ui.text_cache import render_text
+
+
+# длительность вспышки панели после покупки, мс
+FLASH_MS = 200
+
 
 class Shop:
-    def __init__(self, balance, building_manager, resource_manager, panel_width, screen_width, btn_image):
+    def __init__(self, balance, building_manager, resource_manager, panel_width, screen_width, btn_image, timers=None):
         self.balance = balance
         self.building_manager = building_manager
         self.resource_manager = resource_manager
+        self.tables = building_manager.tables
 
         self.panel_width = panel_width
         self.screen_width = screen_width
@@ -18,18 +26,32 @@ class Shop:
         self.items = {}
         self._init_items()
 
-        self.shop_flash_time = 0
+        # часы UI (core.timers); вспышка — срок, а не счётчик в update().
+        # Пустой общий Scheduler тоже годится — проверяем на None, не на истинность
+        self.timers = timers if timers is not None else Scheduler()
+        self._flash_until = 0
+
+        # ключ последней отрисовки — для dirty-rect режима
+        self._drawn_key = None
+
+        # заранее собранные картинки (см. _bake); None — пересобрать
+        self._baked_for = None
+        self._variants = {}
+        self._thumbs = {}
+        self._panel = None
+        self._flash = None
 
     # ------------------------------------------------------------
     # ИНИЦИАЛИЗАЦИЯ
     # ------------------------------------------------------------
     def _init_items(self):
-        for btype, cfg in self.balance["buildings"].items():
-            base_price = cfg["base_price"]  # dict
+        for btype, btable in self.tables.types.items():
             self.items[btype] = {
-                "name": cfg["name"],
-                "price": base_price.copy()
+                "name": btable.name,
+                "bought": 0,
+                "price": btable.price(0)
             }
+        self.invalidate_cache()
 
     def layout_buttons(self):
         x = self.screen_width - self.panel_width + 20
@@ -38,6 +60,55 @@ class Shop:
             rect = self.btn_image.get_rect(topleft=(x, y))
             self.button_rects[btype] = rect
             y += rect.height + 24
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Картинки магазина соберутся заново при следующей отрисовке."""
+        self._baked_for = None
+
+    def _bake(self, screen_height, font, building_manager):
+        """
+        Всё статичное собираем один раз: 4 состояния кнопки
+        (обычная / не хватает / hover / не хватает + hover), миниатюры
+        зданий 40x40, пустую панель с заголовком и заготовку вспышки.
+        """
+        size = self.btn_image.get_size()
+
+        dark = pygame.Surface(size, pygame.SRCALPHA)
+        dark.fill((0, 0, 0, 90))
+        glow = pygame.Surface(size, pygame.SRCALPHA)
+        glow.fill((255, 255, 255, 50))
+
+        self._variants = {}
+        for affordable in (True, False):
+            for hover in (False, True):
+                img = self.btn_image.copy()
+                # затемнение, если не хватает ресурсов
+                if not affordable:
+                    img.blit(dark, (0, 0))
+                # hover
+                if hover:
+                    img.blit(glow, (0, 0))
+                self._variants[(affordable, hover)] = img
+
+        # мини‑здания
+        self._thumbs = {}
+        for btype in self.items.keys():
+            sprite = building_manager.sprites.get(btype)
+            if sprite:
+                self._thumbs[btype] = pygame.transform.scale(sprite, (40, 40))
+
+        # панель с заголовком
+        self._panel = pygame.Surface((self.panel_width, screen_height), pygame.SRCALPHA)
+        self._panel.fill((10, 10, 20, 0))
+        title = render_text(font, "МАГАЗИН", (255, 200, 120))
+        self._panel.blit(title, (20, 20))
+
+        # вспышка: белая заливка, прозрачность — через set_alpha
+        self._flash = pygame.Surface((self.panel_width, screen_height))
+        self._flash.fill((255, 255, 255))
+
+        self._baked_for = (screen_height, font, len(building_manager.sprites))
 
     # ------------------------------------------------------------
     # ВЗАИМОДЕЙСТВИЕ
@@ -76,22 +147,15 @@ class Shop:
         print("can_afford:", self.resource_manager.can_afford_cost(price))
 
         # ✅ 1. Проверка unlock
-        cfg = self.balance["buildings"][btype]
-        unlock = cfg.get("unlock", {})
-
-        # минимальные материалы
-        min_mat = unlock.get("min_materials", 0)
-        if self.resource_manager.get("materials") < min_mat:
-            toast.show(f"Нужно минимум {min_mat} материалов!", 2000)
+        btable = self.tables.get(btype)
+        error = btable.unlock_error(
+            self.resource_manager.get("materials"),
+            lambda req: self.building_manager.count(req) > 0
+        )
+        if error:
+            toast.show(error, 2000)
             return
 
-        # зависимые здания
-        requires = unlock.get("requires", [])
-        for req in requires:
-            if not any(b.type == req for b in self.building_manager.buildings):
-                toast.show("Сначала постройте: " + ", ".join(requires), 2000)
-                return
-
         # ✅ 2. Проверка цены
         if not self.resource_manager.can_afford_cost(price):
             toast.show("Недостаточно ресурсов!", 2000)
@@ -100,38 +164,48 @@ class Shop:
         # ✅ 3. Списание цены
         self.resource_manager.pay_cost(price)
 
-        # ✅ 4. Рост цены
-        growth = cfg["price_growth"]
-        new_price = {}
-        for rid, val in price.items():
-            new_price[rid] = int(val * growth)
-        item["price"] = new_price
+        # ✅ 4. Рост цены (таблица цен посчитана заранее)
+        item["bought"] += 1
+        item["price"] = btable.price(item["bought"])
 
         # ✅ 5. Выбор здания для размещения
         game_state.selected_building_type = btype
         toast.show(f"Постройте: {item['name']}", 2000)
-        self.shop_flash_time = 200
+        self._flash_until = self.timers.now + FLASH_MS
 
     # ------------------------------------------------------------
     # ОБНОВЛЕНИЕ И ОТРИСОВКА
     # ------------------------------------------------------------
-    def update(self, dt):
-        if self.shop_flash_time > 0:
-            self.shop_flash_time -= dt
-            if self.shop_flash_time < 0:
-                self.shop_flash_time = 0
+    @property
+    def shop_flash_time(self):
+        """Сколько мс вспышки осталось."""
+        return max(0, self._flash_until - self.timers.now)
+
+    def dirty_rect(self, screen_height):
+        """Панель магазина, если её картинка поменялась (иначе None)."""
+        key = (
+            self.hover_key,
+            self.shop_flash_time > 0,
+            tuple(
+                (self._total_materials_cost(item["price"]), self.resource_manager.can_afford_cost(item["price"]))
+                for item in self.items.values()
+            )
+        )
+        if key == self._drawn_key and not key[1]:
+            return None
+        self._drawn_key = key
+        return (self.screen_width - self.panel_width, 0, self.panel_width, screen_height)
 
     def _total_materials_cost(self, price_dict):
         return int(price_dict.get("materials", 0))
 
     def draw(self, screen, font, building_manager):
-        panel_x = self.screen_width - self.panel_width
-        panel = pygame.Surface((self.panel_width, screen.get_height()), pygame.SRCALPHA)
-        panel.fill((10, 10, 20, 0))
-        screen.blit(panel, (panel_x, 0))
+        # пересборка — только при смене раскладки/баланса, шрифта или спрайтов
+        if self._baked_for != (screen.get_height(), font, len(building_manager.sprites)):
+            self._bake(screen.get_height(), font, building_manager)
 
-        title = font.render("МАГАЗИН", True, (255, 200, 120))
-        screen.blit(title, (panel_x + 20, 20))
+        panel_x = self.screen_width - self.panel_width
+        screen.blit(self._panel, (panel_x, 0))
 
         for btype, rect in self.button_rects.items():
             item = self.items[btype]
@@ -139,42 +213,23 @@ class Shop:
             total_mat = self._total_materials_cost(price)
             affordable = self.resource_manager.can_afford_cost(price)
 
-            btn_img = self.btn_image.copy()
-
-            # затемнение, если не хватает ресурсов
-            if not affordable:
-                dark = pygame.Surface(btn_img.get_size(), pygame.SRCALPHA)
-                dark.fill((0, 0, 0, 90))
-                btn_img.blit(dark, (0, 0))
-
-            # hover
-            if self.hover_key == btype:
-                glow = pygame.Surface(btn_img.get_size(), pygame.SRCALPHA)
-                glow.fill((255, 255, 255, 50))
-                btn_img.blit(glow, (0, 0))
-
-            screen.blit(btn_img, rect.topleft)
+            screen.blit(self._variants[(affordable, self.hover_key == btype)], rect.topleft)
 
             # мини‑здание
-            sprite = building_manager.sprites.get(btype)
-            if sprite:
-                small = pygame.transform.scale(sprite, (40, 40))
-                icon_x = rect.x + 10
-                icon_y = rect.y + (rect.height - 40) // 2
-                screen.blit(small, (icon_x, icon_y))
-            else:
-                icon_x = rect.x + 10
+            icon_x = rect.x + 10
+            small = self._thumbs.get(btype)
+            if small:
+                screen.blit(small, (icon_x, rect.y + (rect.height - 40) // 2))
 
             # цена
             price_color = (200, 200, 120) if affordable else (150, 80, 80)
-            price_text = font.render(str(total_mat), True, price_color)
+            price_text = render_text(font, str(total_mat), price_color)
             price_x = icon_x + 50
             price_y = rect.y + (rect.height - price_text.get_height()) // 2
             screen.blit(price_text, (price_x, price_y))
 
         # вспышка
-        if self.shop_flash_time > 0:
-            alpha = int(120 * (self.shop_flash_time / 200.0))
-            flash = pygame.Surface((self.panel_width, screen.get_height()), pygame.SRCALPHA)
-            flash.fill((255, 255, 255, alpha))
-            screen.blit(flash, (panel_x, 0))
+        flash = self.shop_flash_time
+        if flash > 0:
+            self._flash.set_alpha(int(120 * (flash / FLASH_MS)))
+            screen.blit(self._flash, (panel_x, 0))
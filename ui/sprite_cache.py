@@ -0,0 +1,74 @@
+# ui/sprite_cache.py
+from collections import OrderedDict
+
+import pygame
+
+from settings import SPRITE_CACHE_MB
+
+
+class SpriteCache:
+    """
+    LRU-кэш уменьшенных картинок: (key, size) -> Surface, с потолком по памяти.
+
+    На каждый уровень зума нужна своя копия спрайта; масштабируем один раз
+    на промах, дальше отдаём готовую. Считаем байты, а не штуки: спрайт
+    в 128 px весит в 64 раза больше, чем в 16 px. Когда сумма выше
+    max_bytes, выкидываются давно не нужные — их пересоберут при следующем
+    обращении. Как и у TextCache, Surface общий — менять его нельзя.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, size, make):
+        """Картинка размера size; make() собирает её на промах."""
+        full_key = (key, size)
+        surf = self.surfaces.get(full_key)
+        if surf is not None:
+            self.surfaces.move_to_end(full_key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = make()
+        self.surfaces[full_key] = surf
+        self.bytes += self._size_of(surf)
+        # только что собранную не выкидываем, даже если она одна больше потолка
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= self._size_of(old)
+            self.evictions += 1
+        return surf
+
+    def scaled(self, key, source, size):
+        """source, уменьшенный до size; key — что это за картинка."""
+        return self.get(key, size, lambda: pygame.transform.smoothscale(source, size))
+
+    @staticmethod
+    def _size_of(surf):
+        w, h = surf.get_size()
+        return w * h * surf.get_bytesize()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# общий кэш на весь процесс: спрайты зданий на всех уровнях зума
+sprite_cache = SpriteCache(SPRITE_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,54 @@
+# ui/text_cache.py
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    LRU-кэш отрендеренного текста: (font, text, color, antialias) -> Surface.
+
+    Почти все строки на экране (значения ресурсов, цены, тосты, квест)
+    от кадра к кадру не меняются, поэтому font.render зовём только на промах.
+    Полученный Surface общий — менять его (set_alpha и т.п.) нельзя,
+    или надо вернуть как было.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# общий кэш на весь процесс
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
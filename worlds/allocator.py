@@ -0,0 +1,138 @@
+# worlds/allocator.py
+
+
+class ProductionAllocator:
+    """
+    Производство за тик одним распределением вместо проверки каждого здания.
+
+    Здания одного типа и уровня одинаковы, поэтому считаем группами:
+    сначала суммарный спрос на каждый ресурс, потом, если чего-то не хватает,
+    делим то, что есть на складе, и в конце одной пачкой пишем в учёт
+    потребление и производство. Производство этого тика потребителям
+    в этом же тике не достаётся — результат не зависит от порядка постройки.
+
+    Дележ при дефиците — по уровням priority (balance.json, больше — раньше):
+    уровень получает ресурс целиком, если хватает, иначе каждая группа уровня
+    работает на одну и ту же долю. Режим proportional — все в одном уровне.
+
+    Всё в целых делениях учёта (core.ledger), доли — детерминированные float.
+    """
+    # проходы перераспределения остатка внутри уровня
+    PASSES = 3
+
+    def __init__(self, tables, mode="priority"):
+        self.tables = tables
+        self.mode = mode
+        self.n_res = len(tables.resource_ids)
+
+        # группы: (need [(слот, деления за тик)], out [...]) — уже на число зданий
+        self.groups = []
+        # уровни priority: [[номер группы]], от старшего к младшему
+        self.tiers = []
+        self.need_sum = [0] * self.n_res
+        self.out_sum = [0] * self.n_res
+        self.dirty = True
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def rebuild(self, buildings):
+        counts = {}
+        for b in buildings:
+            if b.type in self.tables.types:
+                counts[(b.type, b.level)] = counts.get((b.type, b.level), 0) + 1
+
+        # порядок групп фиксированный — от него зависит только округление
+        keys = sorted(counts, key=lambda k: (self.tables.get(k[0]).index, k[1]))
+
+        self.groups = []
+        by_priority = {}
+        self.need_sum = [0] * self.n_res
+        self.out_sum = [0] * self.n_res
+        for btype, level in keys:
+            count = counts[(btype, level)]
+            need, out = self.tables.get(btype).units(level)
+            need = tuple((r, u * count) for r, u in need)
+            out = tuple((r, u * count) for r, u in out)
+            for r, u in need:
+                self.need_sum[r] += u
+            for r, u in out:
+                self.out_sum[r] += u
+
+            priority = self.tables.get(btype).priority if self.mode == "priority" else 0
+            by_priority.setdefault(priority, []).append(len(self.groups))
+            self.groups.append((need, out))
+
+        self.tiers = [by_priority[p] for p in sorted(by_priority, reverse=True)]
+        self.dirty = False
+
+    # ---------- тик ----------
+
+    def produce(self, ledger, buildings, ticks=1):
+        if self.dirty:
+            self.rebuild(buildings)
+        if not self.groups:
+            return
+
+        units = ledger.units
+        n_res = self.n_res
+
+        # быстрый путь: всем хватает на всю пачку
+        for r in range(n_res):
+            if units[r] < self.need_sum[r] * ticks:
+                break
+        else:
+            ledger.apply_vector([(self.out_sum[r] - self.need_sum[r]) * ticks for r in range(n_res)])
+            return
+
+        avail = [max(0, units[r]) for r in range(n_res)]
+        delta = [0] * n_res
+        for tier in self.tiers:
+            fractions = self._share(tier, avail, ticks)
+            for g, f in zip(tier, fractions):
+                if f <= 0:
+                    continue
+                need, out = self.groups[g]
+                for r, u in need:
+                    used = min(int(u * ticks * f), avail[r])
+                    avail[r] -= used
+                    delta[r] -= used
+                for r, u in out:
+                    delta[r] += int(u * ticks * f)
+
+        ledger.apply_vector(delta)
+
+    def _share(self, tier, avail, ticks):
+        """Доля работы каждой группы уровня при складе avail."""
+        fractions = [0.0] * len(tier)
+        left = [float(a) for a in avail]
+
+        for _ in range(self.PASSES):
+            # спрос оставшейся (ещё не выданной) части работы
+            demand = [0.0] * self.n_res
+            for k, g in enumerate(tier):
+                rest = 1.0 - fractions[k]
+                if rest <= 0:
+                    continue
+                for r, u in self.groups[g][0]:
+                    demand[r] += u * ticks * rest
+
+            ratio = [1.0 if demand[r] <= left[r] else left[r] / demand[r] for r in range(self.n_res)]
+
+            progress = False
+            for k, g in enumerate(tier):
+                rest = 1.0 - fractions[k]
+                if rest <= 0:
+                    continue
+                need = self.groups[g][0]
+                f = min([ratio[r] for r, _ in need], default=1.0) * rest
+                if f <= 0:
+                    continue
+                fractions[k] += f
+                for r, u in need:
+                    left[r] -= u * ticks * f
+                progress = True
+
+            if not progress or all(f >= 1.0 for f in fractions):
+                break
+        return fractions
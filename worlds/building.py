@@ -1,5 +1,9 @@
 # worlds/building.py
 
+# длительность анимации спавна, мс
+BUILD_ANIM_MS = 300
+
+
 class Building:
     """
     Один универсальный класс здания.
@@ -10,7 +14,7 @@ class Building:
         self.grid_x = grid_x
         self.grid_y = grid_y
         self.level = level
-        self.build_anim = 300  # ms на анимацию спавна
+        self.build_anim = BUILD_ANIM_MS  # ms на анимацию спавна
 
     def to_dict(self):
         return {
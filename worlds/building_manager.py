@@ -1,35 +1,119 @@
 # worlds/building_manager.py
 import os
-import pygame
 
-from worlds.building import Building
+from core.balance_tables import BalanceTables
+from worlds.allocator import ProductionAllocator
+from worlds.building import Building, BUILD_ANIM_MS
+from worlds.production_kernel import ProductionKernel, numpy_available
 
 
 class BuildingManager:
-    def __init__(self, balance, cell_size, buildings_folder="assets/buildings"):
+    """
+    Здания колонии. Логика (размещение, апгрейды, производство) не зависит
+    от pygame; спрайты грузятся отдельно через load_sprites().
+    """
+    # кадров в заготовленной анимации спавна
+    SPAWN_FRAMES = 12
+    # сторона чанка в клетках: отрисовка перебирает только видимые чанки
+    CHUNK = 16
+
+    def __init__(self, balance, cell_size, buildings_folder=None, tables=None):
         self.balance = balance
+        # собранный balance.json (обычно общий с SimulationEngine)
+        self.tables = tables or BalanceTables(balance)
         self.cell_size = cell_size
         self.buildings_folder = buildings_folder
 
         # список Building
         self.buildings = []
+        # занятость клеток: (grid_x, grid_y) -> Building
+        self.occupancy = {}
+        # чанки мира: (cx, cy) -> [Building] в порядке постройки
+        self.chunks = {}
+        # сводка для заданий и магазина: type -> число зданий / старший уровень
+        self.type_counts = {}
+        self.max_levels = {}
+        # подписчики на изменения зданий: fn(btype), None — поменялось всё
+        self.listeners = []
+        # клетки, чья картинка поменялась за кадр (анимация спавна)
+        self.changed_cells = []
+        # анимация спавна идёт по часам UI (core.timers.Scheduler), их даёт Game;
+        # без них (headless) здания появляются сразу
+        self.timers = None
+        # Building -> момент конца анимации по self.timers.now
+        self.animating = {}
+        self._finished_cells = []
         # спрайты: type -> Surface
         self.sprites = {}
-
-        self._load_sprites()
-
-    def _load_sprites(self):
-        buildings_cfg = self.balance.get("buildings", {})
-        for btype, cfg in buildings_cfg.items():
-            sprite_name = cfg.get("sprite")
-            path = os.path.join(self.buildings_folder, sprite_name) if sprite_name else None
+        # кадры спавна: type -> [(Surface, offset)], от 60% до почти 100%
+        self.spawn_frames = {}
+        # дележ ресурсов при дефиците (simulation.allocation);
+        # в режиме order — старый путь по порядку постройки
+        self.allocator = None
+        if self.tables.allocation != "order":
+            self.allocator = ProductionAllocator(self.tables, self.tables.allocation)
+        # векторный путь для режима order (numpy), включается enable_vectorized()
+        self.kernel = None
+
+        if self.buildings_folder:
+            self.load_sprites(self.buildings_folder)
+
+    # ---------- спрайты (нужен pygame) ----------
+
+    def load_sprites(self, buildings_folder="assets/buildings"):
+        self.buildings_folder = buildings_folder
+        for btype, btable in self.tables.types.items():
+            path = os.path.join(self.buildings_folder, btable.sprite) if btable.sprite else None
             self.sprites[btype] = self._load_sprite(path)
+            self.spawn_frames[btype] = self._make_spawn_frames(self.sprites[btype])
+
+    def _cache(self):
+        from ui.sprite_cache import sprite_cache
+        return sprite_cache
+
+    def sprite_at(self, btype, cell):
+        """Спрайт под клетку в cell пикселей (уровень зума); None — нет спрайта."""
+        sprite = self.sprites.get(btype)
+        if sprite is None or cell == self.cell_size:
+            return sprite
+        return self._cache().scaled(("building", btype), sprite, (cell, cell))
+
+    def spawn_frame_at(self, btype, i, cell):
+        """Кадр i анимации спавна под клетку в cell пикселей: (Surface, offset)."""
+        if cell == self.cell_size:
+            return self.spawn_frames[btype][i]
+        size = int(cell * (0.6 + 0.4 * i / self.SPAWN_FRAMES))
+        spr = self._cache().scaled(("spawn", btype, i), self.sprites[btype], (size, size))
+        return spr, (cell - size) // 2
+
+    def prepare_zoom(self, cell):
+        """
+        Собрать спрайты и кадры спавна всех типов под новый зум заранее —
+        чтобы в цикле отрисовки были только попадания в кэш.
+        """
+        for btype in self.sprites:
+            self.sprite_at(btype, cell)
+            for i in range(self.SPAWN_FRAMES):
+                self.spawn_frame_at(btype, i, cell)
+
+    def _make_spawn_frames(self, sprite):
+        import pygame
+
+        frames = []
+        for i in range(self.SPAWN_FRAMES):
+            k = i / self.SPAWN_FRAMES
+            size = int(self.cell_size * (0.6 + 0.4 * k))
+            offset = (self.cell_size - size) // 2
+            frames.append((pygame.transform.smoothscale(sprite, (size, size)), offset))
+        return frames
 
     def _load_sprite(self, path):
+        import pygame
+        from ui.atlas import load_image
+
         try:
             if path and os.path.exists(path):
-                img = pygame.image.load(path).convert_alpha()
-                return pygame.transform.scale(img, (self.cell_size, self.cell_size))
+                return load_image(path, (self.cell_size, self.cell_size))
         except Exception as e:
             print("Ошибка загрузки спрайта здания:", path, e)
         surf = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
@@ -41,69 +125,122 @@ class BuildingManager:
     def can_place(self, gx, gy, grid_cols, grid_rows):
         if gx < 0 or gy < 0 or gx >= grid_cols or gy >= grid_rows:
             return False
-        for b in self.buildings:
-            if b.grid_x == gx and b.grid_y == gy:
-                return False
-        return True
+        return (gx, gy) not in self.occupancy
+
+    def building_at(self, gx, gy):
+        return self.occupancy.get((gx, gy))
 
     def place_building(self, gx, gy, btype):
         b = Building(btype, gx, gy, level=1)
+        self._start_animation(b)
         self.buildings.append(b)
+        self.occupancy[(gx, gy)] = b
+        self.chunks.setdefault(self._chunk_of(gx, gy), []).append(b)
+        self.type_counts[btype] = self.type_counts.get(btype, 0) + 1
+        self.max_levels[btype] = max(self.max_levels.get(btype, 0), b.level)
+        self._mark_dirty()
+        self._notify(btype)
         return b
 
+    def _chunk_of(self, gx, gy):
+        return gx // self.CHUNK, gy // self.CHUNK
+
+    def _rebuild_chunks(self):
+        self.chunks = {}
+        for b in self.buildings:
+            self.chunks.setdefault(self._chunk_of(b.grid_x, b.grid_y), []).append(b)
+
+    def _start_animation(self, b):
+        if self.timers is None:
+            b.build_anim = 0
+            return
+        self.animating[b] = self.timers.now + BUILD_ANIM_MS
+        self.timers.after(BUILD_ANIM_MS, lambda: self._finish_animation(b))
+
+    def _finish_animation(self, b):
+        if self.animating.pop(b, None) is not None:
+            b.build_anim = 0
+            self._finished_cells.append((b.grid_x, b.grid_y))
+
+    def count(self, btype):
+        return self.type_counts.get(btype, 0)
+
+    def _notify(self, btype):
+        for fn in self.listeners:
+            fn(btype)
+
+    def _rebuild_summary(self):
+        self.type_counts = {}
+        self.max_levels = {}
+        for b in self.buildings:
+            self.type_counts[b.type] = self.type_counts.get(b.type, 0) + 1
+            self.max_levels[b.type] = max(self.max_levels.get(b.type, 0), b.level)
+
+    def _mark_dirty(self):
+        if self.allocator:
+            self.allocator.mark_dirty()
+        if self.kernel:
+            self.kernel.mark_dirty()
+
     # ---------- апгрейды ----------
 
     def get_upgrade_cost(self, building):
-        up_cfg = self.balance["upgrade"]
-        base_cost = up_cfg["base_cost"]           # dict
-        growth = up_cfg["cost_growth"]
-        lvl = building.level
-        # умножаем base_cost на growth^(lvl-1)
-        scaled_cost = {}
-        factor = growth ** (lvl - 1)
-        for rid, base in base_cost.items():
-            scaled_cost[rid] = int(base * factor)
-        return scaled_cost
+        # base_cost * cost_growth^(lvl-1), посчитано заранее
+        return self.tables.upgrade_cost(building.level)
 
     def upgrade_building(self, building):
         building.level += 1
+        self.max_levels[building.type] = max(self.max_levels.get(building.type, 0), building.level)
+        self._mark_dirty()
+        self._notify(building.type)
 
     # ---------- производство ----------
 
-    def produce_all(self, resource_manager):
-        for b in self.buildings:
-            self._produce_from_building(b, resource_manager)
+    def enable_vectorized(self, enabled=True):
+        """
+        Переключает производство на массивы numpy. Возвращает False,
+        если numpy не установлен — тогда остаётся обычный dict-путь.
+        Работает только в режиме allocation = order: распределитель
+        и так считает группами, ему numpy не нужен.
+        """
+        if not enabled:
+            self.kernel = None
+            return False
+        if not numpy_available():
+            print("numpy не найден — векторное производство выключено")
+            return False
+        self.kernel = ProductionKernel(self.tables)
+        return True
 
-    def _produce_from_building(self, building, resource_manager):
-        cfg = self.balance["buildings"].get(building.type)
-        if not cfg:
+    def produce_all(self, resource_manager, ticks=1):
+        """
+        Производство за ticks тиков симуляции одной пачкой.
+        """
+        if self.allocator:
+            self.allocator.produce(resource_manager.ledger, self.buildings, ticks)
             return
+        if self.kernel:
+            self.kernel.produce(resource_manager, self.buildings, ticks)
+            return
+        for b in self.buildings:
+            self._produce_from_building(b, resource_manager, ticks)
 
-        prod = cfg.get("production", {})
-        cons = cfg.get("consumption", {})
-        mult = cfg.get("level_multiplier", 1.0)
+    def _produce_from_building(self, building, resource_manager, ticks=1):
+        btable = self.tables.get(building.type)
+        if not btable:
+            return
 
-        # вычисляем множитель уровня
-        if building.level > 1:
-            level_factor = mult ** (building.level - 1)
-        else:
-            level_factor = 1.0
+        # потребление и производство за тик в делениях учёта
+        need, out = btable.units(building.level)
+        ledger = resource_manager.ledger
 
-        # проверка, хватает ли ресурсов на потребление
-        scaled_cons = {}
-        for rid, amount in cons.items():
-            scaled_cons[rid] = amount * level_factor
-        if not resource_manager.can_afford_cost(scaled_cons):
+        # сколько тиков из пачки здание может оплатить
+        ticks = ledger.affordable(need, ticks)
+        if ticks <= 0:
             return  # здание не работает, если не хватает ресурсов
 
-        # списываем потребление
-        resource_manager.pay_cost(scaled_cons)
-
-        # даём производство
-        scaled_prod = {}
-        for rid, amount in prod.items():
-            scaled_prod[rid] = amount * level_factor
-        resource_manager.add_many(scaled_prod)
+        ledger.debit(need, ticks)
+        ledger.credit(out, ticks)
 
     # ---------- загрузка/сохранение ----------
 
@@ -112,26 +249,46 @@ class BuildingManager:
 
     def load_from_save_data(self, data_list):
         self.buildings = [Building.from_dict(d) for d in data_list]
+        # загруженная колония уже стоит — без анимации спавна
+        for b in self.buildings:
+            b.build_anim = 0
+        self.animating = {}
+        self.occupancy = {(b.grid_x, b.grid_y): b for b in self.buildings}
+        self._rebuild_chunks()
+        self._rebuild_summary()
+        self._mark_dirty()
+        self._notify(None)
+
+    def reset(self):
+        self.buildings = []
+        self.occupancy = {}
+        self.chunks = {}
+        self.animating = {}
+        self._rebuild_summary()
+        self._mark_dirty()
+        self._notify(None)
 
     # ---------- отрисовка ----------
 
-    def update_animations(self, dt):
-        for b in self.buildings:
-            if b.build_anim > 0:
-                b.build_anim -= dt
-                if b.build_anim < 0:
-                    b.build_anim = 0
+    def update_animations(self, dt=None):
+        """
+        Только здания, у которых идёт анимация: остаток build_anim по часам
+        UI и клетки на перерисовку. Конец анимации снимает таймер.
+        """
+        self.changed_cells = self._finished_cells
+        self._finished_cells = []
+        if not self.animating:
+            return
+        now = self.timers.now
+        for b, end in self.animating.items():
+            b.build_anim = max(0, end - now)
+            self.changed_cells.append((b.grid_x, b.grid_y))
 
     # ---------- информация об апгрейде и производстве ----------
 
-    def get_building_cfg(self, building):
-        if building is None:
-            return {}
-        return self.balance.get("buildings", {}).get(building.type, {})
-
     def get_max_level(self, building):
-        cfg = self.get_building_cfg(building)
-        return cfg.get("max_level", 5)  # если не указано — максимум 5
+        btable = self.tables.get(building.type) if building else None
+        return btable.max_level if btable else 1
 
     def get_production_info(self, building):
         """
@@ -143,45 +300,63 @@ class BuildingManager:
             "max_level": int
         }
         """
-        if building is None:
+        btable = self.tables.get(building.type) if building else None
+        if btable is None:
             return {"current": {}, "next": {}, "gain": {}, "max_level": 1}
 
-        cfg = self.get_building_cfg(building)
-        base_prod = cfg.get("production", {})
-        mult = cfg.get("level_multiplier", 1.0)
-
-        current = {}
-        next_ = {}
-        gain = {}
-
-        for rid, amount in base_prod.items():
-            cur = amount * (mult ** (building.level - 1))
-            nxt = amount * (mult ** building.level)
-            current[rid] = cur
-            next_[rid] = nxt
-            gain[rid] = nxt - cur
+        current = btable.production_at(building.level)
+        next_ = btable.production_at(building.level + 1)
+        gain = {rid: next_[rid] - current[rid] for rid in current}
 
         return {
             "current": current,
             "next": next_,
             "gain": gain,
-            "max_level": self.get_max_level(building)
+            "max_level": btable.max_level
         }
 
-    def draw(self, screen):
-        for b in self.buildings:
-            sprite = self.sprites.get(b.type)
+    def visible(self, view, cell=None):
+        """
+        Здания в чанках, пересекающих view = (x0, y0, x1, y1) в пикселях мира;
+        cell — размер клетки в этих пикселях (по умолчанию cell_size).
+        """
+        size = self.CHUNK * (cell or self.cell_size)
+        x0, y0, x1, y1 = view
+        for cy in range(int(y0) // size, (int(y1) - 1) // size + 1):
+            for cx in range(int(x0) // size, (int(x1) - 1) // size + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk:
+                    yield from chunk
+
+    def draw(self, screen, camera=None, cell=None):
+        """
+        Без камеры — все здания в координатах мира (как раньше).
+        С камерой — только видимые чанки, со сдвигом камеры.
+        cell — клетка на экране при текущем зуме; уменьшенные спрайты
+        берутся из общего кэша (ui.sprite_cache), в цикле не масштабируем.
+        """
+        cell = cell or self.cell_size
+        if camera is None:
+            buildings, ox, oy = self.buildings, 0, 0
+        else:
+            buildings = self.visible(camera.view_rect(), cell)
+            ox, oy = camera.offset
+
+        # спрайты текущего зума — один раз на тип, а не на здание
+        sprites = {btype: self.sprite_at(btype, cell) for btype in self.sprites}
+        frames = self.SPAWN_FRAMES
+
+        for b in buildings:
+            sprite = sprites.get(b.type)
             if not sprite:
                 continue
-            px = b.grid_x * self.cell_size
-            py = b.grid_y * self.cell_size
+            px = b.grid_x * cell - ox
+            py = b.grid_y * cell - oy
 
             if b.build_anim > 0:
-                k = 1.0 - b.build_anim / 300.0
+                k = 1.0 - b.build_anim / BUILD_ANIM_MS
                 k = max(0.0, min(1.0, k))
-                size = int(self.cell_size * (0.6 + 0.4 * k))
-                offset = (self.cell_size - size) // 2
-                spr = pygame.transform.smoothscale(sprite, (size, size))
+                spr, offset = self.spawn_frame_at(b.type, min(frames - 1, int(k * frames)), cell)
                 screen.blit(spr, (px + offset, py + offset))
             else:
                 screen.blit(sprite, (px, py))
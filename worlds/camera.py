@@ -0,0 +1,50 @@
+# worlds/camera.py
+
+
+class Camera:
+    """
+    Окно на мир: (x, y) — левый верхний угол видимой области в пикселях
+    мира. Позиция зажата так, чтобы за край мира не заглядывать.
+    """
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0.0
+        self.y = 0.0
+
+    @property
+    def offset(self):
+        """Целочисленный сдвиг для blit — без дрожания на дробных позициях."""
+        return int(self.x), int(self.y)
+
+    def move_to(self, x, y):
+        """Возвращает True, если видимая область сдвинулась."""
+        before = self.offset
+        self.x = min(max(0.0, x), max(0, self.world_width - self.view_width))
+        self.y = min(max(0.0, y), max(0, self.world_height - self.view_height))
+        return self.offset != before
+
+    def resize_world(self, world_width, world_height, x, y):
+        """Новый размер мира (смена зума) и новая позиция в его пикселях."""
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = self.y = 0.0
+        self.move_to(x, y)
+
+    def pan(self, dx, dy):
+        return self.move_to(self.x + dx, self.y + dy)
+
+    def to_screen(self, wx, wy):
+        ox, oy = self.offset
+        return wx - ox, wy - oy
+
+    def to_world(self, sx, sy):
+        ox, oy = self.offset
+        return sx + ox, sy + oy
+
+    def view_rect(self):
+        """(x0, y0, x1, y1) видимой области в пикселях мира."""
+        ox, oy = self.offset
+        return ox, oy, ox + self.view_width, oy + self.view_height
@@ -1,48 +1,167 @@
 # worlds/grid.py
 import pygame
 
+from worlds.camera import Camera
+
 
 class Grid:
-    def __init__(self, width, height, cell_size, shop_width):
+    """
+    Клетки мира cols x rows; на экране — окно камеры шириной
+    width - shop_width. Если размер мира не задан, мир равен окну.
+
+    Зум — дискретные уровни zoom_levels (доля от cell_size): на экране
+    клетка занимает cell_px пикселей, камера живёт в пикселях текущего зума.
+    """
+    def __init__(self, width, height, cell_size, shop_width, cols=None, rows=None, zoom_levels=(1.0,)):
         self.width = width
         self.height = height
         self.cell_size = cell_size
         self.shop_width = shop_width
 
-        self.cols = (self.width - self.shop_width) // self.cell_size
-        self.rows = self.height // self.cell_size
+        # видимая часть поля (слева от магазина)
+        self.view_width = self.width - self.shop_width
+        self.view_height = self.height
+
+        self.cols = cols or self.view_width // self.cell_size
+        self.rows = rows or self.view_height // self.cell_size
+
+        self.zoom_levels = tuple(zoom_levels)
+        self.zoom_index = 0
+        self.cell_px = self._cell_px(0)
+
+        self.camera = Camera(
+            self.view_width, self.view_height,
+            self.cols * self.cell_px, self.rows * self.cell_px
+        )
 
+        # клетка под курсором; (-1, -1) — курсор не над полем
         self.hover_cell = (0, 0)
+        self._mouse = (0, 0)
+
+        # линии сетки: cell_px -> (вертикальная, горизонтальная) полоска
+        self._strips = {}
+
+    def _cell_px(self, index):
+        return max(1, round(self.cell_size * self.zoom_levels[index]))
+
+    @property
+    def zoom(self):
+        return self.zoom_levels[self.zoom_index]
 
     def update_hover(self, mouse_pos):
-        mx, my = mouse_pos
-        self.hover_cell = (mx // self.cell_size, my // self.cell_size)
+        self._mouse = mouse_pos
+        self.hover_cell = self.cell_at(mouse_pos)
+
+    def cell_at(self, screen_pos):
+        """Клетка мира под точкой экрана или (-1, -1) вне поля."""
+        sx, sy = screen_pos
+        if sx < 0 or sy < 0 or sx >= self.view_width or sy >= self.view_height:
+            return (-1, -1)
+        wx, wy = self.camera.to_world(sx, sy)
+        return (int(wx // self.cell_px), int(wy // self.cell_px))
+
+    def pan(self, dx, dy):
+        """Сдвиг камеры; True, если картинка поля поменялась."""
+        moved = self.camera.pan(dx, dy)
+        if moved:
+            # под неподвижным курсором теперь другая клетка
+            self.hover_cell = self.cell_at(self._mouse)
+        return moved
+
+    # ---------- зум ----------
+
+    def set_zoom(self, index, anchor=None):
+        """
+        Переключить уровень зума; точка мира под anchor (по умолчанию —
+        центр поля) остаётся на месте. True, если уровень поменялся.
+        """
+        index = max(0, min(len(self.zoom_levels) - 1, index))
+        if index == self.zoom_index:
+            return False
+        if anchor is None:
+            anchor = (self.view_width // 2, self.view_height // 2)
+
+        sx, sy = anchor
+        wx, wy = self.camera.to_world(sx, sy)
+        old_px = self.cell_px
+        self.zoom_index = index
+        self.cell_px = self._cell_px(index)
+
+        k = self.cell_px / old_px
+        self.camera.resize_world(
+            self.cols * self.cell_px, self.rows * self.cell_px,
+            wx * k - sx, wy * k - sy
+        )
+        self.hover_cell = self.cell_at(self._mouse)
+        return True
+
+    def zoom_by(self, step, anchor=None):
+        """step > 0 — приблизить (крупнее клетки), step < 0 — отдалить."""
+        return self.set_zoom(self.zoom_index - step, anchor)
+
+    # ---------- отрисовка ----------
+
+    def cell_rect(self, gx, gy):
+        """Клетка на экране (с учётом камеры и зума)."""
+        sx, sy = self.camera.to_screen(gx * self.cell_px, gy * self.cell_px)
+        return pygame.Rect(sx, sy, self.cell_px, self.cell_px)
 
     def draw(self, screen):
-        surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        """
+        Линии сетки: на уровень зума — две полоски толщиной в пиксель
+        (вертикальная и горизонтальная), каждая линия — один blit со
+        сдвигом на остаток камеры. Полоски весят килобайты, так что живут
+        вне кэша спрайтов и не вытесняются.
+        """
+        cell = self.cell_px
+        vertical, horizontal = self._line_strips(cell)
+        ox, oy = self.camera.offset
+        x0 = -(ox % cell)
+        y0 = -(oy % cell)
+
+        clip = screen.get_clip()
+        screen.set_clip(clip.clip((0, 0, self.view_width, self.view_height)))
+        for x in range(x0, self.view_width, cell):
+            screen.blit(vertical, (x, y0))
+        for y in range(y0, self.view_height, cell):
+            screen.blit(horizontal, (x0, y))
+        screen.set_clip(clip)
+
+    def _line_strips(self, cell):
+        strips = self._strips.get(cell)
+        if strips is None:
+            strips = self._strips[cell] = self._build_strips(cell)
+        return strips
+
+    def _build_strips(self, cell):
+        # на клетку длиннее окна — чтобы сдвиг на остаток от клетки не оголял край
+        w = self.view_width + cell
+        h = self.view_height + cell
+        color = (255, 255, 255, 40)
 
-        # вертикальные линии
-        for x in range(self.cols + 1):
-            px = x * self.cell_size
-            pygame.draw.line(surf, (255, 255, 255, 40), (px, 0), (px, self.height), 1)
+        horizontal = pygame.Surface((w, 1), pygame.SRCALPHA)
+        horizontal.fill(color)
 
-        # горизонтальные линии только по полю слева
-        for y in range(self.rows + 1):
-            py = y * self.cell_size
-            pygame.draw.line(surf, (255, 255, 255, 40), (0, py), (self.width - self.shop_width, py), 1)
+        # на пересечениях пусто — там уже лежит горизонтальная линия
+        vertical = pygame.Surface((1, h), pygame.SRCALPHA)
+        vertical.fill(color)
+        for y in range(0, h, cell):
+            vertical.set_at((0, y), (0, 0, 0, 0))
 
-        screen.blit(surf, (0, 0))
+        return vertical, horizontal
 
     def draw_hover(self, screen, can_place):
         gx, gy = self.hover_cell
         if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
             return
 
-        px = gx * self.cell_size
-        py = gy * self.cell_size
+        rect = self.cell_rect(gx, gy)
         color = (60, 220, 120) if can_place else (220, 80, 80)
 
-        s = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        s = pygame.Surface((self.cell_px, self.cell_px), pygame.SRCALPHA)
         s.fill((*color, 80))
-        screen.blit(s, (px, py))
-        pygame.draw.rect(screen, color, (px, py, self.cell_size, self.cell_size), 2)
+        clip = screen.get_clip()
+        screen.set_clip(clip.clip((0, 0, self.view_width, self.view_height)))
+        screen.blit(s, rect.topleft)
+        pygame.draw.rect(screen, color, rect, 2)
+        screen.set_clip(clip)
@@ -0,0 +1,186 @@
+# worlds/production_kernel.py
+try:
+    import numpy as np
+except ImportError:  # numpy не обязателен — тогда работает обычный dict-путь
+    np = None
+
+
+def numpy_available():
+    return np is not None
+
+
+class ProductionKernel:
+    """
+    Векторный путь производства для BuildingManager.
+
+    Здания хранятся массивом типов, потребление/производство — строками
+    в делениях учёта (core.ledger, int64) из BalanceTables. Для каждого
+    здания заранее собраны строки need (потребление за тик) и out
+    (производство за тик), а также их суммы — поэтому тик, в котором всем
+    хватает ресурсов, стоит O(число ресурсов), а не O(число зданий).
+    Арифметика целая, так что результат совпадает с dict-путём бит в бит —
+    пока у ресурсов нет потолка max: dict-путь зажимает каждое начисление,
+    ядро — только итог тика.
+
+    Семантика как у dict-пути: здание либо работает целиком, либо простаивает,
+    если не может оплатить своё потребление; очередь — порядок в списке,
+    и производство отработавших зданий доступно следующим в том же тике.
+    Пачка из нескольких тиков при дефиците тоже считается как в dict-пути:
+    каждое здание по порядку оплачивает сразу столько тиков, сколько может.
+    """
+    # короче такого отрезка векторный проход дороже простого цикла
+    MIN_VECTOR_RUN = 64
+
+    def __init__(self, tables):
+        if np is None:
+            raise RuntimeError("Для ProductionKernel нужен numpy")
+
+        # ресурсы -> плотные индексы (из BalanceTables)
+        self.resource_ids = list(tables.resource_ids)
+        self.resource_index = tables.resource_index
+
+        # типы зданий -> индексы
+        self.tables = tables
+        self.type_ids = list(tables.type_ids)
+        self.type_index = {btype: i for i, btype in enumerate(self.type_ids)}
+
+        # строки (тип, уровень) -> номер строки в need/out-таблицах
+        self._row_index = {}
+        self._row_need = []
+        self._row_out = []
+
+        n_res = len(self.resource_ids)
+        self.types = np.zeros(0, dtype=np.int32)
+        self.need = np.zeros((0, n_res), dtype=np.int64)
+        self.out = np.zeros((0, n_res), dtype=np.int64)
+        self.need_sum = np.zeros(n_res, dtype=np.int64)
+        self.out_sum = np.zeros(n_res, dtype=np.int64)
+        self._need_rows = []
+        self._out_rows = []
+
+        self.dirty = True
+
+    # ---------- синхронизация со списком зданий ----------
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def _row(self, btype, level):
+        key = (btype, level)
+        row = self._row_index.get(key)
+        if row is None:
+            n_res = len(self.resource_ids)
+            need_units, out_units = self.tables.get(btype).units(level)
+            need = [0] * n_res
+            out = [0] * n_res
+            for r, u in need_units:
+                need[r] = u
+            for r, u in out_units:
+                out[r] = u
+            row = len(self._row_need)
+            self._row_index[key] = row
+            self._row_need.append(need)
+            self._row_out.append(out)
+        return row
+
+    def rebuild(self, buildings):
+        # здания неизвестного типа не производят ничего (как и в dict-пути)
+        known = [b for b in buildings if b.type in self.type_index]
+        self.types = np.fromiter((self.type_index[b.type] for b in known), dtype=np.int32, count=len(known))
+        rows = np.fromiter((self._row(b.type, b.level) for b in known), dtype=np.int32, count=len(known))
+
+        n_res = len(self.resource_ids)
+        row_need = np.array(self._row_need, dtype=np.int64).reshape(-1, n_res)
+        row_out = np.array(self._row_out, dtype=np.int64).reshape(-1, n_res)
+        self.need = row_need[rows]
+        self.out = row_out[rows]
+        self.need_sum = self.need.sum(axis=0)
+        self.out_sum = self.out.sum(axis=0)
+
+        # разреженные строки для скалярного хвоста при дефиците
+        self._need_rows = self._sparse_rows(self.need)
+        self._out_rows = self._sparse_rows(self.out)
+
+        self.dirty = False
+
+    def _sparse_rows(self, matrix):
+        return [
+            [(r, amount) for r, amount in enumerate(row) if amount]
+            for row in matrix.tolist()
+        ]
+
+    # ---------- тик ----------
+
+    def produce(self, resource_manager, buildings, ticks=1):
+        if self.dirty:
+            self.rebuild(buildings)
+        if not len(self.types):
+            return
+
+        # первые слоты учёта — ровно resource_ids из тех же таблиц
+        ledger = resource_manager.ledger
+        avail = np.array(ledger.units[:len(self.resource_ids)], dtype=np.int64)
+
+        # быстрый путь: всем хватает на всю пачку
+        if np.all(avail >= self.need_sum * ticks):
+            delta = (self.out_sum - self.need_sum) * ticks
+        elif ticks == 1:
+            delta = self._delta_with_shortage(avail)
+        else:
+            # дефицит на пачку — как dict-путь, здание за зданием
+            self._produce_batches(ledger, ticks)
+            return
+
+        ledger.apply_vector(delta.tolist())
+
+    def _produce_batches(self, ledger, ticks):
+        """Каждое здание по порядку оплачивает min(ticks, сколько хватает) тиков сразу."""
+        for need, out in zip(self._need_rows, self._out_rows):
+            n = ledger.affordable(need, ticks)
+            if n > 0:
+                ledger.debit(need, n)
+                ledger.credit(out, n)
+
+    def _delta_with_shortage(self, avail):
+        """
+        Кто работает при дефиците — ровно как в dict-пути: по порядку списка,
+        каждое здание оплачивает потребление из того, что осталось, плюс
+        производство уже отработавших перед ним.
+
+        Пока отказов мало, идём векторно: префиксные суммы до первого отказа,
+        дальше со следующего здания. Если проходы стали короткими (отказ через
+        отказ), хвост дорабатываем простым циклом по разреженным строкам.
+        """
+        left = avail.copy()
+        cand = np.arange(len(self.types))
+
+        while len(cand) >= self.MIN_VECTOR_RUN:
+            need = self.need[cand]
+            out = self.out[cand]
+            cum_need = np.cumsum(need, axis=0)
+            cum_out_before = np.cumsum(out, axis=0) - out
+            ok = np.all(cum_need - cum_out_before <= left, axis=1)
+            if ok.all():
+                left += cum_out_before[-1] + out[-1] - cum_need[-1]
+                return left - avail
+
+            k = int(np.argmin(ok))  # первый отказ
+            if k:
+                left += cum_out_before[k] - cum_need[k - 1]
+            cand = cand[k + 1:]
+            if k < self.MIN_VECTOR_RUN:
+                break
+
+        left = left.tolist()
+        for i in cand.tolist():
+            need = self._need_rows[i]
+            for r, amount in need:
+                if left[r] < amount:
+                    break
+            else:
+                for r, amount in need:
+                    left[r] -= amount
+                for r, amount in self._out_rows[i]:
+                    left[r] += amount
+
+        return np.array(left, dtype=np.int64) - avail